@@ -7,7 +7,9 @@ Supports:
 2. Instant Voice Cloning - clones speaker's voice from video sample for seamless dubbing
 """
 
+import json
 import logging
+import os
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 import tempfile
@@ -16,12 +18,49 @@ import uuid
 
 logger = logging.getLogger(__name__)
 
+
+def _run_quiet(cmd: list) -> None:
+    """
+    Run an ffmpeg-style command whose output is only interesting on failure:
+    stdout is discarded and stderr captured as bytes, so Python never decodes
+    ffmpeg's (potentially large) progress chatter on the happy path.
+    """
+    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+
+def _stderr_text(e: subprocess.CalledProcessError) -> str:
+    """Decode captured stderr lazily in error handlers."""
+    stderr = e.stderr
+    if isinstance(stderr, bytes):
+        return stderr.decode("utf-8", errors="replace")
+    return stderr or ""
+
+
 # Pre-built ElevenLabs voice IDs (these are free tier voices)
 VOICE_PRESETS = {
     "female": "21m00Tcm4TlvDq8ikWAM",  # Rachel - natural female voice
     "male": "pNInz6obpgDQGcFmaJgB"      # Adam - natural male voice
 }
 
+# Leading/trailing silence trim shared by trim_audio_silence and the
+# single-pass stretch in time_stretch_audio
+SILENCE_TRIM_FILTER = (
+    "silenceremove=start_periods=1:start_silence=0.05:start_threshold=-50dB:"
+    "stop_periods=-1:stop_duration=0.05:stop_threshold=-50dB"
+)
+
+# Max entries kept in the on-disk TTS cache before the LRU sweep trims it
+TTS_CACHE_LIMIT = 256
+
+# Intermediate TTS mp3s are decoded exactly once by the stretch stage, so
+# request narrowband 22.05kHz/32kbps output - half the bytes to download,
+# store and decode, with no audible cost for speech overlay
+TTS_OUTPUT_FORMAT = "mp3_22050_32"
+
+# Filter graphs longer than this go through -filter_complex_script to stay
+# clear of platform argv limits (~32K on Windows)
+FILTER_SCRIPT_THRESHOLD = 4096
+
 
 class ElevenLabsDubber:
     """
@@ -42,11 +81,26 @@ class ElevenLabsDubber:
         """
         self.api_key = api_key
         self.ffmpeg_path = ffmpeg_path
+
+        # Concurrent TTS requests per job (bounded to stay inside the
+        # ElevenLabs per-account concurrency limit)
+        self.tts_concurrency = 4
         
         # Configure ElevenLabs client
         try:
             from elevenlabs.client import ElevenLabs
-            self.client = ElevenLabs(api_key=api_key)
+            import httpx
+
+            # One shared connection pool for every TTS/clone/delete call:
+            # HTTP/2 multiplexing when the h2 package is available, plain
+            # keep-alive otherwise - either way no per-call TCP+TLS handshake
+            limits = httpx.Limits(max_keepalive_connections=16)
+            try:
+                http_client = httpx.Client(http2=True, limits=limits)
+            except ImportError:
+                http_client = httpx.Client(limits=limits)
+
+            self.client = ElevenLabs(api_key=api_key, httpx_client=http_client)
             logger.info("ElevenLabsDubber initialized with pre-built voices + voice cloning")
         except ImportError:
             raise ImportError("elevenlabs package not installed. Run: pip install elevenlabs")
@@ -56,6 +110,35 @@ class ElevenLabsDubber:
         
         # Track cloned voices for cleanup
         self._cloned_voice_ids = []
+
+        # Cache parsed sidecar transcripts (path -> list of cues)
+        self._transcript_cache: Dict[Path, list] = {}
+
+        # Cache audio codec per video path (avoids repeated ffprobe forks)
+        self._audio_codec_cache: Dict[str, Optional[str]] = {}
+
+        # Whether this ffmpeg build ships the rubberband filter (probed lazily)
+        self._has_rubberband: Optional[bool] = None
+
+        # Shared AudioAnalyzer, constructed lazily on first use
+        self._analyzer = None
+
+        # Session-scoped temp dir (lazy), reused across dubbing jobs
+        self._tmp_root: Optional[Path] = None
+        self._tmp_finalizer = None
+        self._job_counter = 0
+
+        # On-disk TTS cache keyed by (voice, model, text) - repeated phrases
+        # skip the paid synthesis call entirely
+        self._tts_cache_dir = Path(tempfile.gettempdir()) / "vidmod_tts_cache"
+        self._sweep_tts_cache()
+
+        # Persistent voice-clone cache (sample fingerprint -> voice_id).
+        # With persist_cloned_voices on, clones survive the call so reruns
+        # of the same video skip the clone+delete cycle and its quota cost.
+        self.persist_cloned_voices = True
+        self._voice_cache_path = Path.home() / ".vidmod" / "voice_cache.json"
+        self._voice_cache: Optional[Dict[str, str]] = None
     
     def extend_audio_sample(self, input_path: Path, output_path: Path, target_duration: float = 10.0) -> Path:
         """
@@ -105,20 +188,119 @@ class ElevenLabsDubber:
         ]
 
         try:
-            subprocess.run(cmd, check=True, capture_output=True, text=True)
+            _run_quiet(cmd)
 
             # Verify extended duration
             final_duration = self.get_audio_duration(output_path)
             logger.info(f"✅ Audio extended to {final_duration:.1f}s (target: {target_duration:.1f}s) - ready for high-quality voice cloning!")
 
             # Clean up concat file
-            if concat_file.exists():
-                concat_file.unlink()
+            concat_file.unlink(missing_ok=True)
 
             return output_path
         except subprocess.CalledProcessError as e:
-            logger.error(f"Audio extension failed: {e.stderr}")
-            raise RuntimeError(f"Failed to extend audio: {e.stderr}")
+            logger.error(f"Audio extension failed: {_stderr_text(e)}")
+            raise RuntimeError(f"Failed to extend audio: {_stderr_text(e)}")
+
+    @staticmethod
+    def _fast_copy_or_link(src: Path, dst: Path) -> Path:
+        """
+        Pass a file through without re-encoding: hard-link when src and dst
+        share a filesystem (O(1) directory op), byte-copy otherwise.
+        """
+        try:
+            Path(dst).unlink(missing_ok=True)
+            os.link(src, dst)
+        except OSError:
+            import shutil
+            shutil.copy(src, dst)
+        return dst
+
+    @property
+    def analyzer(self):
+        """
+        Lazily constructed AudioAnalyzer, shared across dubbing calls so the
+        Gemini client is configured once instead of per invocation.
+        """
+        if self._analyzer is None:
+            from core.audio_analyzer import AudioAnalyzer
+            from app.config import get_settings
+            self._analyzer = AudioAnalyzer(api_key=get_settings().gemini_api_key)
+        return self._analyzer
+
+    @property
+    def tmp_root(self) -> Path:
+        """
+        Session-scoped temp directory, created lazily on first use.
+
+        Reusing one directory across jobs avoids per-call mkdir/rmdir churn;
+        it is removed when the dubber is garbage-collected or via
+        cleanup_cloned_voices().
+        """
+        if self._tmp_root is None:
+            import shutil
+            import weakref
+            self._tmp_root = Path(tempfile.mkdtemp(prefix="vidmod_dubber_"))
+            self._tmp_finalizer = weakref.finalize(
+                self, shutil.rmtree, str(self._tmp_root), ignore_errors=True
+            )
+        return self._tmp_root
+
+    def _new_job_dir(self) -> Path:
+        """Create a fresh per-job subdirectory under the session temp root."""
+        self._job_counter += 1
+        job_dir = self.tmp_root / f"job{self._job_counter}"
+        job_dir.mkdir()
+        return job_dir
+
+    def _extract_audio_wav(self, video_path: Path) -> Optional[Path]:
+        """
+        Decode the video's audio track once to a mono 16kHz wav for the
+        analysis passes. Uploading/scanning the slim wav avoids re-demuxing
+        the full container for every consumer that only needs audio.
+
+        Returns None if extraction fails (callers fall back to the video).
+        """
+        wav_path = self.tmp_root / f"analysis_{uuid.uuid4().hex[:8]}.wav"
+        cmd = [
+            self.ffmpeg_path, "-y",
+            "-i", os.fspath(video_path),
+            "-vn",
+            "-ac", "1",
+            "-ar", "16000",
+            "-f", "wav",
+            os.fspath(wav_path)
+        ]
+        try:
+            _run_quiet(cmd)
+            return wav_path
+        except subprocess.CalledProcessError as e:
+            logger.warning(f"Audio pre-extraction failed, using video directly: {_stderr_text(e)}")
+            return None
+
+    def _probe_audio_codec(self, video_path: Path) -> Optional[str]:
+        """Get the codec name of the first audio stream (cached per path)."""
+        key = os.fspath(video_path)
+        if key in self._audio_codec_cache:
+            return self._audio_codec_cache[key]
+
+        cmd = [
+            self.ffmpeg_path.replace("ffmpeg", "ffprobe"),
+            "-v", "error",
+            "-select_streams", "a:0",
+            "-show_entries", "stream=codec_name",
+            "-of", "default=noprint_wrappers=1:nokey=1",
+            key
+        ]
+        try:
+            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+            codec = result.stdout.strip() or None
+        except Exception as e:
+            logger.warning(f"Audio codec probe failed for {video_path.name}: {e}")
+            codec = None
+
+        self._audio_codec_cache[key] = codec
+        return codec
 
     def extract_audio_sample(
         self,
@@ -151,14 +333,31 @@ class ElevenLabsDubber:
 
         logger.info(f"Extracting voice sample: {start_time}s to {end_time}s ({duration:.1f}s)")
 
-        # Extract the base sample
-        temp_output = output_path.parent / f"temp_{output_path.name}" if ensure_min_duration and duration < min_duration else output_path
+        needs_extension = ensure_min_duration and duration < min_duration
 
-        cmd = [
+        # Stream-copy instead of re-encoding when the source track is already
+        # in a format ElevenLabs accepts - skips the whole MP3 encode
+        codec = self._probe_audio_codec(video_path)
+        use_copy = codec in ("mp3", "aac")
+        copy_suffix = ".mp3" if codec == "mp3" else ".m4a"
+        if use_copy and not needs_extension:
+            # The extension path re-encodes to MP3 anyway, so only adjust the
+            # final suffix when the copied sample is the deliverable
+            output_path = output_path.with_suffix(copy_suffix)
+
+        # Extract the base sample
+        if needs_extension:
+            temp_name = f"temp_{output_path.stem}{copy_suffix if use_copy else output_path.suffix}"
+            temp_output = output_path.parent / temp_name
+        else:
+            temp_output = output_path
+
+        # -ss before -i: fast keyframe seek instead of decoding from the start
+        encode_cmd = [
             self.ffmpeg_path,
             "-y",
-            "-i", str(video_path),
             "-ss", str(start_time),
+            "-i", str(video_path),
             "-t", str(duration),
             "-vn",  # No video
             "-acodec", "libmp3lame",
@@ -168,22 +367,46 @@ class ElevenLabsDubber:
             str(temp_output)
         ]
 
+        if use_copy:
+            cmd = [
+                self.ffmpeg_path,
+                "-y",
+                "-ss", str(start_time),
+                "-i", str(video_path),
+                "-t", str(duration),
+                "-vn",
+                "-c:a", "copy",
+                str(temp_output)
+            ]
+        else:
+            cmd = encode_cmd
+
         try:
-            subprocess.run(cmd, check=True, capture_output=True, text=True)
+            try:
+                _run_quiet(cmd)
+            except subprocess.CalledProcessError as e:
+                if not use_copy:
+                    raise
+                # Stream copy can fail on odd containers - fall back to re-encoding
+                logger.warning(f"Stream-copy extraction failed, re-encoding: {_stderr_text(e)}")
+                output_path = output_path.with_suffix(".mp3")
+                temp_output = output_path.parent / f"temp_{output_path.name}" if needs_extension else output_path
+                encode_cmd[-1] = str(temp_output)
+                _run_quiet(encode_cmd)
+
             logger.info(f"Voice sample extracted: {temp_output}")
 
             # Extend if needed
-            if ensure_min_duration and duration < min_duration:
+            if needs_extension:
                 logger.warning(f"Voice sample is only {duration:.1f}s. Extending to {min_duration:.1f}s for optimal ElevenLabs quality...")
                 self.extend_audio_sample(temp_output, output_path, target_duration=min_duration)
                 # Clean up temp file
-                if temp_output.exists():
-                    temp_output.unlink()
+                temp_output.unlink(missing_ok=True)
 
             return output_path
         except subprocess.CalledProcessError as e:
-            logger.error(f"Failed to extract audio sample: {e.stderr}")
-            raise RuntimeError(f"Audio extraction failed: {e.stderr}")
+            logger.error(f"Failed to extract audio sample: {_stderr_text(e)}")
+            raise RuntimeError(f"Audio extraction failed: {_stderr_text(e)}")
     
     def create_instant_voice_clone(
         self,
@@ -228,62 +451,217 @@ class ElevenLabsDubber:
             logger.error(f"Voice cloning failed: {e}")
             raise RuntimeError(f"Failed to create voice clone: {e}")
 
+    @staticmethod
+    def _parse_subtitle_timestamp(ts: str) -> float:
+        """Convert an SRT/VTT timestamp (HH:MM:SS,mmm or MM:SS.mmm) to seconds."""
+        parts = ts.strip().replace(",", ".").split(":")
+        seconds = 0.0
+        for part in parts:
+            seconds = seconds * 60 + float(part)
+        return seconds
+
+    def _parse_subtitle_cues(self, transcript_path: Path) -> list:
+        """
+        Parse an .srt/.vtt file into (start_time, end_time, text) cues.
+        Returns an empty list if the file can't be parsed.
+        """
+        import re
+
+        cues = []
+        try:
+            content = transcript_path.read_text(encoding="utf-8", errors="replace")
+        except OSError as e:
+            logger.warning(f"Could not read transcript {transcript_path}: {e}")
+            return cues
+
+        timing_re = re.compile(
+            r"(\d{1,2}:\d{2}:\d{2}[.,]\d{3}|\d{1,2}:\d{2}[.,]\d{3})"
+            r"\s*-->\s*"
+            r"(\d{1,2}:\d{2}:\d{2}[.,]\d{3}|\d{1,2}:\d{2}[.,]\d{3})"
+        )
+
+        for block in re.split(r"\n\s*\n", content):
+            m = timing_re.search(block)
+            if not m:
+                continue
+            start = self._parse_subtitle_timestamp(m.group(1))
+            end = self._parse_subtitle_timestamp(m.group(2))
+            text_lines = block[m.end():].strip().splitlines()
+            text = " ".join(line.strip() for line in text_lines if line.strip())
+            if text:
+                cues.append((start, end, text))
+
+        return cues
+
+    def _find_matches_in_transcript(
+        self,
+        video_path: Path,
+        word_replacements: Dict[str, str]
+    ) -> Optional[list]:
+        """
+        Scan a sidecar .srt/.vtt transcript for the target words.
+
+        A local transcript scan is essentially free compared to a full
+        Gemini audio pass, so try it first. Word timings are interpolated
+        from the cue span by word position.
+
+        Returns:
+            List of ProfanityMatch objects if a transcript exists and EVERY
+            target word was located at least once; None otherwise (caller
+            falls back to full audio analysis).
+        """
+        import re
+
+        transcript_path = None
+        for suffix in (".srt", ".vtt"):
+            candidate = video_path.with_suffix(suffix)
+            if candidate.exists():
+                transcript_path = candidate
+                break
+
+        if transcript_path is None:
+            return None
+
+        cues = self._transcript_cache.get(transcript_path)
+        if cues is None:
+            cues = self._parse_subtitle_cues(transcript_path)
+            self._transcript_cache[transcript_path] = cues
+
+        if not cues:
+            return None
+
+        from core.audio_analyzer import ProfanityMatch
+
+        replacements = {w.lower(): r for w, r in word_replacements.items()}
+        targets = frozenset(replacements)
+        matches = []
+        found = set()
+
+        for start, end, text in cues:
+            words = text.split()
+            if not words:
+                continue
+            span = end - start
+            for idx, raw in enumerate(words):
+                word = re.sub(r"[^\w']", "", raw).lower()
+                if word in targets:
+                    # Approximate word timing by position within the cue
+                    w_start = start + span * (idx / len(words))
+                    w_end = start + span * ((idx + 1) / len(words))
+                    matches.append(ProfanityMatch(
+                        word=word,
+                        start_time=round(w_start, 3),
+                        end_time=round(w_end, 3),
+                        replacement=replacements[word],
+                        confidence="high",
+                        context=text
+                    ))
+                    found.add(word)
+
+        if found < targets:
+            missing = sorted(targets - found)
+            logger.info(f"Transcript missing target words {missing}, falling back to audio analysis")
+            return None
+
+        logger.info(f"Located all target words in {transcript_path.name}: {len(matches)} instances")
+        return matches
+
+    def _load_voice_cache(self) -> Dict[str, str]:
+        """Load the fingerprint -> voice_id cache (empty on any error)."""
+        if self._voice_cache is None:
+            try:
+                with open(self._voice_cache_path) as f:
+                    self._voice_cache = json.load(f)
+            except (OSError, ValueError):
+                self._voice_cache = {}
+        return self._voice_cache
+
+    def _save_voice_cache(self):
+        """Write the voice cache back to disk (best effort)."""
+        try:
+            self._voice_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._voice_cache_path, "w") as f:
+                json.dump(self._voice_cache or {}, f)
+        except OSError as e:
+            logger.warning(f"Could not persist voice cache: {e}")
+
+    @staticmethod
+    def _fingerprint_sample(sample_path: Path) -> str:
+        """Content fingerprint of an audio sample for clone reuse."""
+        import hashlib
+        return hashlib.blake2b(sample_path.read_bytes()).hexdigest()
+
+    def get_or_create_voice_clone(
+        self,
+        sample_path: Path,
+        voice_name: Optional[str] = None
+    ) -> str:
+        """
+        Reuse a previously cloned voice for this exact sample if it still
+        exists on the account; otherwise clone it and record the mapping.
+
+        Re-runs of the same video (parameter tuning, retries) hit the cache
+        and skip the clone upload entirely.
+        """
+        cache = self._load_voice_cache()
+        fingerprint = self._fingerprint_sample(sample_path)
+
+        voice_id = cache.get(fingerprint)
+        if voice_id:
+            try:
+                self.client.voices.get(voice_id)
+                logger.info(f"♻️ Reusing cached voice clone: {voice_id}")
+                return voice_id
+            except Exception:
+                logger.info(f"Cached voice {voice_id} no longer exists, re-cloning")
+                cache.pop(fingerprint, None)
+
+        voice_id = self.create_instant_voice_clone(sample_path, voice_name)
+        cache[fingerprint] = voice_id
+        self._save_voice_cache()
+        return voice_id
+
     def cluster_matches(self, matches: list, threshold: float = 1.0) -> list:
         """
         Group adjacent word matches into continuous dubbing regions.
         Clusters matches from the same speaker if the gap is < threshold.
+
+        Boundary detection is vectorized: one numpy pass over the sorted
+        timestamps instead of per-match Python comparisons.
         """
         if not matches:
             return []
-        
+
+        import numpy as np
+
         # Sort by start time just in case
         sorted_matches = sorted(matches, key=lambda m: m.start_time)
-        
-        clusters = []
-        if not sorted_matches:
-            return []
-            
-        current_cluster = {
-            'speaker_id': sorted_matches[0].speaker_id,
-            'start_time': sorted_matches[0].start_time,
-            'end_time': sorted_matches[0].end_time,
-            'original_words': [sorted_matches[0].word],
-            'replacement_words': [sorted_matches[0].replacement]
-        }
-        
-        for m in sorted_matches[1:]:
-            # Conditions for clustering:
-            # 1. Same speaker
-            # 2. Gap is small (< threshold)
-            gap = m.start_time - current_cluster['end_time']
-            if m.speaker_id == current_cluster['speaker_id'] and gap < threshold:
-                # Extend current cluster
-                current_cluster['end_time'] = m.end_time
-                current_cluster['original_words'].append(m.word)
-                current_cluster['replacement_words'].append(m.replacement)
-            else:
-                # Close current and start new
-                clusters.append(current_cluster)
-                current_cluster = {
-                    'speaker_id': m.speaker_id,
-                    'start_time': m.start_time,
-                    'end_time': m.end_time,
-                    'original_words': [m.word],
-                    'replacement_words': [m.replacement]
-                }
-        
-        clusters.append(current_cluster)
-        
-        # Format phrases
+        n = len(sorted_matches)
+
+        starts = np.fromiter((m.start_time for m in sorted_matches), dtype=np.float64, count=n)
+        ends = np.fromiter((m.end_time for m in sorted_matches), dtype=np.float64, count=n)
+        speakers = [m.speaker_id for m in sorted_matches]
+
+        # A new cluster starts where the speaker changes or the gap to the
+        # previous match reaches the threshold
+        gaps = starts[1:] - ends[:-1]
+        speaker_change = np.fromiter(
+            (speakers[i] != speakers[i - 1] for i in range(1, n)),
+            dtype=bool, count=n - 1
+        )
+        boundaries = np.flatnonzero((gaps >= threshold) | speaker_change) + 1
+
         formatted_clusters = []
-        for c in clusters:
+        prev = 0
+        for boundary in [*boundaries.tolist(), n]:
             formatted_clusters.append({
-                'speaker_id': c['speaker_id'],
-                'start_time': c['start_time'],
-                'end_time': c['end_time'],
-                'phrase': " ".join(c['replacement_words'])
+                'speaker_id': speakers[prev],
+                'start_time': float(starts[prev]),
+                'end_time': float(ends[boundary - 1]),
+                'phrase': " ".join(m.replacement for m in sorted_matches[prev:boundary])
             })
-            
+            prev = boundary
+
         logger.info(f"Clustered {len(matches)} words into {len(formatted_clusters)} dubbing phrases")
         return formatted_clusters
     
@@ -319,119 +697,314 @@ class ElevenLabsDubber:
         cmd = [
             self.ffmpeg_path, "-y",
             "-i", str(input_path),
-            "-af", "silenceremove=start_periods=1:start_silence=0.05:start_threshold=-50dB:stop_periods=-1:stop_duration=0.05:stop_threshold=-50dB",
+            "-af", SILENCE_TRIM_FILTER,
             str(output_path)
         ]
 
         try:
-            subprocess.run(cmd, check=True, capture_output=True, text=True)
+            _run_quiet(cmd)
             return output_path
         except subprocess.CalledProcessError as e:
-            logger.error(f"Silence trimming failed: {e.stderr}")
+            logger.error(f"Silence trimming failed: {_stderr_text(e)}")
             import shutil
             shutil.copy(input_path, output_path)
             return output_path
     
-    def time_stretch_audio(
-        self, 
-        input_path: Path, 
-        output_path: Path, 
-        target_duration: float
-    ) -> Path:
+    def _measure_trimmed_duration(self, input_path: Path) -> float:
         """
-        Time-stretch audio to EXACTLY match target duration.
-        Trims silence first for perfect pacing.
+        Get the duration of the audio after silence trimming, via a
+        decode-only pass (-f null) - nothing is encoded or written to disk.
+        """
+        import re
+
+        cmd = [
+            self.ffmpeg_path,
+            "-i", str(input_path),
+            "-af", SILENCE_TRIM_FILTER,
+            "-f", "null", "-"
+        ]
+        try:
+            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Trimmed-duration measurement failed: {_stderr_text(e)}")
+            return 0.0
+
+        # ffmpeg reports progress on stderr; the last time= is the output length
+        times = re.findall(r"time=(\d+):(\d{2}):(\d{2}(?:\.\d+)?)", result.stderr)
+        if not times:
+            return 0.0
+        hours, minutes, seconds = times[-1]
+        return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+    @property
+    def rubberband_available(self) -> bool:
+        """
+        Whether this ffmpeg build includes the rubberband filter
+        (requires a build with --enable-librubberband). Probed once.
+        """
+        if self._has_rubberband is None:
+            try:
+                result = subprocess.run(
+                    [self.ffmpeg_path, "-hide_banner", "-filters"],
+                    check=True, capture_output=True, text=True
+                )
+                self._has_rubberband = "rubberband" in result.stdout
+            except Exception:
+                self._has_rubberband = False
+            if self._has_rubberband:
+                logger.info("ffmpeg rubberband filter available - using WSOLA stretching")
+        return self._has_rubberband
+
+    def _stretch_filter_chain(self, source_duration: float, target_duration: float) -> str:
+        """
+        Build the per-stream filter chain that trims silence, stretches the
+        speech to target_duration and applies 10ms anti-click fades.
+
+        Prefers rubberband (WSOLA - crisper speech transients, no STFT
+        round-trip) when the ffmpeg build has it, otherwise chains atempo.
         """
-        # Step 1: Trim leading/trailing silence to get "actual" speech duration
-        temp_trimmed = input_path.parent / f"trimmed_{uuid.uuid4().hex[:8]}.mp3"
-        self.trim_audio_silence(input_path, temp_trimmed)
-        
-        source_duration = self.get_audio_duration(temp_trimmed)
-        
-        if source_duration <= 0:
-            logger.warning(f"Could not get source duration, copying as-is")
-            import shutil
-            shutil.copy(input_path, output_path)
-            if temp_trimmed.exists(): temp_trimmed.unlink()
-            return output_path
-        
-        # Calculate tempo ratio (source/target)
         tempo_ratio = source_duration / target_duration
         logger.info(f"Time-stretch (trimmed): {source_duration:.3f}s → {target_duration:.3f}s (ratio={tempo_ratio:.3f})")
-        
-        # Build chained atempo filters
+
+        if self.rubberband_available and abs(tempo_ratio - 1.0) > 0.001:
+            # rubberband takes any ratio directly; crisp transients suit speech
+            tempo_chain = f"rubberband=tempo={tempo_ratio:.6f}:pitchq=quality:transients=crisp"
+            fade_dur = 0.01
+            mute_start = max(0, target_duration - fade_dur)
+            return (
+                f"{SILENCE_TRIM_FILTER},"
+                f"{tempo_chain},"
+                f"atrim=0:{target_duration:.6f},"
+                f"afade=t=in:d={fade_dur},"
+                f"afade=t=out:st={mute_start:.6f}:d={fade_dur}"
+            )
+
+        # Build chained atempo filters (atempo only accepts [0.5, 2.0])
         atempo_filters = []
         remaining = tempo_ratio
-        
+
         while remaining > 2.0:
             atempo_filters.append("atempo=2.0")
             remaining /= 2.0
         while remaining < 0.5:
             atempo_filters.append("atempo=0.5")
             remaining /= 0.5
-        
+
         if 0.5 <= remaining <= 2.0 and abs(remaining - 1.0) > 0.001:
             atempo_filters.append(f"atempo={remaining:.6f}")
-        
+
         tempo_chain = ",".join(atempo_filters) if atempo_filters else "anull"
-        
+
         # Add micro-fades (10ms) to prevent clicks
         fade_dur = 0.01
         mute_start = max(0, target_duration - fade_dur)
-        
-        filter_complex = (
-            f"[0:a]{tempo_chain},"
+
+        return (
+            f"{SILENCE_TRIM_FILTER},"
+            f"{tempo_chain},"
             f"atrim=0:{target_duration:.6f},"
             f"afade=t=in:d={fade_dur},"
             f"afade=t=out:st={mute_start:.6f}:d={fade_dur}"
-            f"[out]"
         )
-        
+
+    def batch_time_stretch(self, items: list) -> None:
+        """
+        Stretch several clips with a single ffmpeg invocation.
+
+        One process handles N inputs with one filter branch each, which
+        amortizes subprocess spawn + ffmpeg init across the whole batch.
+
+        Args:
+            items: List of (input_path, output_path, target_duration,
+                   source_duration) tuples; source_duration is the
+                   silence-trimmed speech length of the input
+        """
+        cmd = [self.ffmpeg_path, "-y"]
+        for input_path, _, _, _ in items:
+            cmd.extend(["-i", os.fspath(input_path)])
+
+        parts = []
+        for i, (_, _, target_duration, source_duration) in enumerate(items):
+            chain = self._stretch_filter_chain(source_duration, target_duration)
+            parts.append(f"[{i}:a]{chain}[o{i}]")
+        cmd.extend(["-filter_complex", ";".join(parts)])
+
+        for i, (_, output_path, _, _) in enumerate(items):
+            cmd.extend([
+                "-map", f"[o{i}]",
+                "-ac", "2", "-ar", "48000", "-c:a", "libopus", "-b:a", "96k",
+                os.fspath(output_path)
+            ])
+
+        _run_quiet(cmd)
+
+    def time_stretch_audio(
+        self,
+        input_path: Path,
+        output_path: Path,
+        target_duration: float
+    ) -> Path:
+        """
+        Time-stretch audio to EXACTLY match target duration.
+        Trims silence and stretches in a single encode pass: the trimmed
+        speech length is measured with a decode-only run, so there is no
+        intermediate trimmed file (one decode+encode instead of two each).
+        """
+        source_duration = self._measure_trimmed_duration(input_path)
+
+        if source_duration <= 0:
+            logger.warning(f"Could not get source duration, copying as-is")
+            import shutil
+            shutil.copy(input_path, output_path)
+            return output_path
+
+        filter_complex = (
+            f"[0:a]{self._stretch_filter_chain(source_duration, target_duration)}[out]"
+        )
+
         cmd = [
             self.ffmpeg_path, "-y",
-            "-i", str(temp_trimmed),
+            "-i", str(input_path),
             "-filter_complex", filter_complex,
             "-map", "[out]",
-            "-ac", "2", "-ar", "44100", "-acodec", "libmp3lame", "-q:a", "2",
+            "-ac", "2", "-ar", "48000", "-c:a", "libopus", "-b:a", "96k",
             str(output_path)
         ]
-        
-        try:
-            subprocess.run(cmd, check=True, capture_output=True, text=True)
-            if temp_trimmed.exists(): temp_trimmed.unlink()
-            return output_path
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Time-stretch failed: {e.stderr}")
-            if temp_trimmed.exists(): temp_trimmed.unlink()
-            return output_path
-        
+
         try:
-            subprocess.run(cmd, check=True, capture_output=True, text=True)
-            
-            # Verify output duration
-            actual_duration = self.get_audio_duration(output_path)
-            diff = abs(actual_duration - target_duration)
-            
-            if diff > 0.05:  # More than 50ms off
-                logger.warning(f"Duration mismatch: target={target_duration:.3f}s, actual={actual_duration:.3f}s")
-            else:
-                logger.info(f"✅ Stretched audio: {actual_duration:.3f}s (target: {target_duration:.3f}s)")
-            
+            _run_quiet(cmd)
             return output_path
-            
         except subprocess.CalledProcessError as e:
-            logger.error(f"Time-stretch failed: {e.stderr}")
-            # Fallback: simple pad/trim without tempo change
-            fallback_cmd = [
-                self.ffmpeg_path, "-y",
-                "-i", str(input_path),
-                "-filter_complex", f"[0:a]apad,atrim=0:{target_duration:.6f}[out]",
-                "-map", "[out]",
-                str(output_path)
-            ]
-            subprocess.run(fallback_cmd, check=True, capture_output=True, text=True)
+            logger.error(f"Time-stretch failed: {_stderr_text(e)}")
             return output_path
     
+    def _generate_and_stretch_segments(
+        self,
+        clusters: list,
+        temp_path: Path,
+        synthesize
+    ) -> list:
+        """
+        Generate TTS audio for each cluster and time-stretch it.
+
+        Generation (network-bound) and trimmed-duration measurement
+        (decode-only ffmpeg) run in separate thread pools chained with
+        as_completed, then all stretches are encoded in a single batched
+        ffmpeg invocation so the process spawn cost is paid once.
+
+        Args:
+            clusters: Cluster dicts from cluster_matches()
+            temp_path: Directory for intermediate audio files
+            synthesize: Callable (cluster, output_path) -> Path producing raw TTS audio
+
+        Returns:
+            List of (stretched_path, start_time, end_time) tuples in cluster order
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        max_workers = min(self.tts_concurrency, len(clusters)) or 1
+        items = [None] * len(clusters)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as gen_pool, \
+             ThreadPoolExecutor(max_workers=max_workers) as measure_pool:
+
+            # Submit grouped by speaker so consecutive requests hit the same
+            # voice (keeps per-voice state warm server-side); results are
+            # indexed, so output order is unaffected
+            submit_order = sorted(
+                range(len(clusters)),
+                key=lambda i: str(clusters[i].get('speaker_id', ''))
+            )
+
+            gen_futures = {}
+            for i in submit_order:
+                raw_dub = temp_path / f"phrase_raw_{i}.mp3"
+                gen_futures[gen_pool.submit(synthesize, clusters[i], raw_dub)] = i
+
+            measure_futures = {}
+            for fut in as_completed(gen_futures):
+                i = gen_futures[fut]
+                raw_dub = fut.result()
+                measure_futures[measure_pool.submit(
+                    self._measure_trimmed_duration, raw_dub
+                )] = (i, raw_dub)
+
+            for fut in as_completed(measure_futures):
+                i, raw_dub = measure_futures[fut]
+                c = clusters[i]
+                stretched_dub = temp_path / f"phrase_stretched_{i}.opus"
+                items[i] = (
+                    raw_dub,
+                    stretched_dub,
+                    c['end_time'] - c['start_time'],
+                    fut.result()
+                )
+
+        # Clips whose trimmed duration couldn't be measured are copied as-is
+        # (same fallback time_stretch_audio applies)
+        import shutil
+        batch = [item for item in items if item[3] > 0]
+        for raw_dub, stretched_dub, _, source_duration in items:
+            if source_duration <= 0:
+                logger.warning(f"Could not get source duration for {raw_dub.name}, copying as-is")
+                shutil.copy(raw_dub, stretched_dub)
+
+        if batch:
+            try:
+                self.batch_time_stretch(batch)
+            except subprocess.CalledProcessError as e:
+                logger.warning(f"Batched stretch failed, falling back to per-clip: {_stderr_text(e)}")
+                for raw_dub, stretched_dub, target_duration, _ in batch:
+                    self.time_stretch_audio(raw_dub, stretched_dub, target_duration)
+
+        return [
+            (item[1], c['start_time'], c['end_time'])
+            for item, c in zip(items, clusters)
+        ]
+
+    def _tts_cache_file(self, voice_id: str, model_id: str, text: str) -> Path:
+        """Cache file path for a (voice, model, text) synthesis request."""
+        import hashlib
+        digest = hashlib.blake2b(
+            f"{voice_id}|{model_id}|{TTS_OUTPUT_FORMAT}|{text}".encode()
+        ).hexdigest()
+        return self._tts_cache_dir / f"{digest}.mp3"
+
+    def _tts_cache_lookup(self, cache_file: Path, output_path: Path) -> bool:
+        """Copy a cached synthesis result to output_path if present."""
+        try:
+            if cache_file.exists():
+                import shutil
+                shutil.copy(cache_file, output_path)
+                os.utime(cache_file)  # refresh mtime so LRU sweeps keep hot entries
+                return True
+        except OSError as e:
+            logger.warning(f"TTS cache read failed: {e}")
+        return False
+
+    def _tts_cache_store(self, output_path: Path, cache_file: Path):
+        """Store a freshly generated synthesis result in the cache."""
+        try:
+            self._tts_cache_dir.mkdir(parents=True, exist_ok=True)
+            import shutil
+            shutil.copy(output_path, cache_file)
+        except OSError as e:
+            logger.warning(f"TTS cache write failed: {e}")
+
+    def _sweep_tts_cache(self):
+        """Evict the oldest cache entries beyond TTS_CACHE_LIMIT."""
+        try:
+            if not self._tts_cache_dir.is_dir():
+                return
+            entries = sorted(
+                self._tts_cache_dir.glob("*.mp3"),
+                key=lambda p: p.stat().st_mtime
+            )
+            for stale in entries[:max(0, len(entries) - TTS_CACHE_LIMIT)]:
+                stale.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"TTS cache sweep failed: {e}")
+
     def generate_speech_with_clone(
         self,
         text: str,
@@ -450,6 +1023,11 @@ class ElevenLabsDubber:
         Returns:
             Path to generated audio file
         """
+        cache_file = self._tts_cache_file(voice_id, "eleven_multilingual_v2", text)
+        if self._tts_cache_lookup(cache_file, output_path):
+            logger.info(f"TTS cache hit (cloned voice): '{text[:50]}...'")
+            return output_path
+
         logger.info(f"Generating speech with cloned voice at 1.2x speed: '{text[:50]}...'")
 
         try:
@@ -457,6 +1035,7 @@ class ElevenLabsDubber:
                 voice_id=voice_id,
                 text=text,
                 model_id="eleven_multilingual_v2",
+                output_format=TTS_OUTPUT_FORMAT,
                 voice_settings={
                     "stability": 0.3,
                     "similarity_boost": 0.95,
@@ -466,10 +1045,11 @@ class ElevenLabsDubber:
                 }
             )
 
-            with open(output_path, 'wb') as f:
-                for chunk in audio:
-                    f.write(chunk)
+            # Join chunks once and write with a single syscall instead of
+            # pushing each small chunk through the default file buffer
+            Path(output_path).write_bytes(b"".join(audio))
 
+            self._tts_cache_store(output_path, cache_file)
             logger.info(f"Cloned speech generated (faster): {output_path}")
             return output_path
 
@@ -491,6 +1071,11 @@ class ElevenLabsDubber:
             self.client.voices.delete(voice_id)
             if voice_id in self._cloned_voice_ids:
                 self._cloned_voice_ids.remove(voice_id)
+            if self._voice_cache and voice_id in self._voice_cache.values():
+                self._voice_cache = {
+                    k: v for k, v in self._voice_cache.items() if v != voice_id
+                }
+                self._save_voice_cache()
             logger.info(f"Deleted cloned voice: {voice_id}")
             return True
         except Exception as e:
@@ -502,6 +1087,12 @@ class ElevenLabsDubber:
         for voice_id in self._cloned_voice_ids.copy():
             self.delete_cloned_voice(voice_id)
         logger.info("Cleaned up all cloned voices")
+
+        # Also drop the session temp dir; it is recreated lazily if needed
+        if self._tmp_finalizer is not None:
+            self._tmp_finalizer()
+            self._tmp_finalizer = None
+            self._tmp_root = None
     
     def patch_audio_seamless(
         self,
@@ -527,12 +1118,18 @@ class ElevenLabsDubber:
         """
         if not dub_segments:
             logger.warning("No dub segments provided, copying original")
-            import shutil
-            shutil.copy(video_path, output_path)
+            self._fast_copy_or_link(video_path, output_path)
             return output_path
         
         logger.info(f"Patching {len(dub_segments)} audio segments onto video...")
-        
+
+        # Fast path: single-segment jobs don't need the mute+amix graph
+        if len(dub_segments) == 1:
+            try:
+                return self._patch_single_segment(video_path, dub_segments, output_path)
+            except subprocess.CalledProcessError as e:
+                logger.warning(f"Single-segment fast path failed, using full graph: {_stderr_text(e)}")
+
         # Try AI-based audio separation first
         try:
             from core.audio_separator import AudioSeparator
@@ -556,6 +1153,71 @@ class ElevenLabsDubber:
                 output_path=output_path
             )
     
+    def _filter_complex_args(self, filter_complex: str, script_dir: Path) -> list:
+        """
+        ffmpeg args for a filter graph: inline for typical sizes, via a
+        -filter_complex_script file once the graph is long enough to risk
+        the platform command-line limit (videos with many matches).
+        """
+        if len(filter_complex) < FILTER_SCRIPT_THRESHOLD:
+            return ["-filter_complex", filter_complex]
+
+        script_path = script_dir / f"filter_{uuid.uuid4().hex[:8]}.txt"
+        script_path.write_text(filter_complex)
+        logger.info(f"Large filter graph ({len(filter_complex)} chars) written to {script_path.name}")
+        return ["-filter_complex_script", os.fspath(script_path)]
+
+    def _patch_single_segment(
+        self,
+        video_path: Path,
+        dub_segments: list,
+        output_path: Path
+    ) -> Path:
+        """
+        Specialized patch for a single dub segment: cut the original audio
+        around the segment and concat pre + dub + post.
+
+        Avoids the sample-accurate volume=enable expression and amix entirely,
+        which is markedly cheaper for the common one-cluster case.
+        """
+        dub_path, start_time, end_time = dub_segments[0]
+
+        logger.info(f"Patching single segment via cut-and-concat ({start_time:.2f}s - {end_time:.2f}s)")
+
+        # Normalize all pieces to the same format so concat accepts them
+        fmt = "aformat=sample_rates=44100:channel_layouts=stereo"
+
+        parts = []
+        labels = []
+        if start_time > 0.01:
+            parts.append(f"[0:a]atrim=0:{start_time:.6f},{fmt},asetpts=PTS-STARTPTS[pre]")
+            labels.append("pre")
+        parts.append(f"[1:a]{fmt},asetpts=PTS-STARTPTS[dub]")
+        labels.append("dub")
+        parts.append(f"[0:a]atrim=start={end_time:.6f},{fmt},asetpts=PTS-STARTPTS[post]")
+        labels.append("post")
+        parts.append(
+            "".join(f"[{label}]" for label in labels)
+            + f"concat=n={len(labels)}:v=0:a=1[out]"
+        )
+
+        cmd = [
+            self.ffmpeg_path, "-y",
+            "-i", os.fspath(video_path),
+            "-i", os.fspath(dub_path),
+            "-filter_complex", ";".join(parts),
+            "-map", "0:v",
+            "-map", "[out]",
+            "-c:v", "copy",
+            "-c:a", "aac",
+            "-b:a", "192k",
+            os.fspath(output_path)
+        ]
+
+        _run_quiet(cmd)
+        logger.info(f"✅ Audio patched (single-segment fast path): {output_path}")
+        return output_path
+
     def _patch_with_separated_audio(
         self,
         video_path: Path,
@@ -618,35 +1280,35 @@ class ElevenLabsDubber:
         
         filter_complex = ";".join(filter_parts)
         
-        # Build FFmpeg command
+        # Build FFmpeg command (convert paths to strings once at the boundary)
         cmd = [
             self.ffmpeg_path, "-y",
-            "-i", str(video_path),        # Input 0: Video
-            "-i", str(vocals_path),        # Input 1: Vocals
-            "-i", str(instrumental_path),  # Input 2: Instrumental
+            "-i", os.fspath(video_path),        # Input 0: Video
+            "-i", os.fspath(vocals_path),        # Input 1: Vocals
+            "-i", os.fspath(instrumental_path),  # Input 2: Instrumental
         ]
-        
+
         # Add dub segments as inputs
         for dub_path, _, _ in dub_segments:
-            cmd.extend(["-i", str(dub_path)])
-        
+            cmd.extend(["-i", os.fspath(dub_path)])
+
+        cmd.extend(self._filter_complex_args(filter_complex, Path(dub_segments[0][0]).parent))
         cmd.extend([
-            "-filter_complex", filter_complex,
             "-map", "0:v",
             "-map", "[out]",
             "-c:v", "copy",
             "-c:a", "aac",
             "-b:a", "192k",
-            str(output_path)
+            os.fspath(output_path)
         ])
         
         try:
-            subprocess.run(cmd, check=True, capture_output=True, text=True)
+            _run_quiet(cmd)
             logger.info(f"✅ Audio patched with separated tracks: {output_path}")
             return output_path
         except subprocess.CalledProcessError as e:
-            logger.error(f"Separated audio patching failed: {e.stderr}")
-            raise RuntimeError(f"Failed to patch separated audio: {e.stderr}")
+            logger.error(f"Separated audio patching failed: {_stderr_text(e)}")
+            raise RuntimeError(f"Failed to patch separated audio: {_stderr_text(e)}")
     
     def _patch_with_frequency_ducking(
         self,
@@ -703,29 +1365,29 @@ class ElevenLabsDubber:
         
         cmd = [
             self.ffmpeg_path, "-y",
-            "-i", str(video_path)
+            "-i", os.fspath(video_path)
         ]
-        
+
         for dub_path, _, _ in dub_segments:
-            cmd.extend(["-i", str(dub_path)])
-        
+            cmd.extend(["-i", os.fspath(dub_path)])
+
+        cmd.extend(self._filter_complex_args(filter_complex, Path(dub_segments[0][0]).parent))
         cmd.extend([
-            "-filter_complex", filter_complex,
             "-map", "0:v",
             "-map", "[out]",
             "-c:v", "copy",
             "-c:a", "aac",
             "-b:a", "192k",
-            str(output_path)
+            os.fspath(output_path)
         ])
         
         try:
-            subprocess.run(cmd, check=True, capture_output=True, text=True)
+            _run_quiet(cmd)
             logger.info(f"✅ Audio patched with frequency ducking: {output_path}")
             return output_path
         except subprocess.CalledProcessError as e:
-            logger.error(f"Audio patching failed: {e.stderr}")
-            raise RuntimeError(f"Failed to patch audio: {e.stderr}")
+            logger.error(f"Audio patching failed: {_stderr_text(e)}")
+            raise RuntimeError(f"Failed to patch audio: {_stderr_text(e)}")
 
     
     def generate_speech(
@@ -749,6 +1411,11 @@ class ElevenLabsDubber:
         """
         voice_id = VOICE_PRESETS.get(voice_type, VOICE_PRESETS["female"])
 
+        cache_file = self._tts_cache_file(voice_id, "eleven_multilingual_v2", text)
+        if self._tts_cache_lookup(cache_file, output_path):
+            logger.info(f"TTS cache hit ({voice_type} voice): '{text}'")
+            return output_path
+
         # Always generate at 1.2x speed (faster) to ensure shorter duration
         # This way we only expand (slow down) to fit target, never compress
         logger.info(f"Generating speech with {voice_type} voice at 1.2x speed: '{text}'")
@@ -759,6 +1426,7 @@ class ElevenLabsDubber:
                 voice_id=voice_id,
                 text=text,
                 model_id="eleven_multilingual_v2",
+                output_format=TTS_OUTPUT_FORMAT,
                 voice_settings={
                     "stability": 0.35,
                     "similarity_boost": 0.90,
@@ -766,11 +1434,11 @@ class ElevenLabsDubber:
                 }
             )
 
-            # Save audio - audio is an iterator of bytes
-            with open(output_path, 'wb') as f:
-                for chunk in audio:
-                    f.write(chunk)
+            # Save audio - audio is an iterator of bytes; join once and write
+            # with a single syscall
+            Path(output_path).write_bytes(b"".join(audio))
 
+            self._tts_cache_store(output_path, cache_file)
             logger.info(f"Speech generated (faster): {output_path}")
             return output_path
 
@@ -803,39 +1471,36 @@ class ElevenLabsDubber:
         
         if not word_replacements:
             logger.warning("No words to replace, copying original video")
-            import shutil
-            shutil.copy(video_path, output_path)
+            self._fast_copy_or_link(video_path, output_path)
             return output_path
         
         logger.info(f"Dubbing {len(word_replacements)} word replacements with {voice_type} voice")
         
         try:
-            # Step 1: Analyze audio to find word occurrences
-            from core.audio_analyzer import AudioAnalyzer
-            from app.config import get_settings
-            
-            settings = get_settings()
-            analyzer = AudioAnalyzer(api_key=settings.gemini_api_key)
-            
-            # Build custom words list from user's input
-            custom_words = list(word_replacements.keys())
-            logger.info(f"Detecting instances of: {custom_words}")
-            
-            # Detect all instances of these words
-            matches = analyzer.analyze_profanity(
-                video_path,
-                custom_words=custom_words
-            )
-            
-            # Override replacements with user's custom replacements
-            for match in matches:
-                if match.word in word_replacements:
-                    match.replacement = word_replacements[match.word]
-            
+            # Step 1: Find word occurrences - try a sidecar transcript first,
+            # only fall back to the (expensive) Gemini audio pass on a miss
+            matches = self._find_matches_in_transcript(video_path, word_replacements)
+
+            if matches is None:
+                # Build custom words list from user's input
+                custom_words = tuple(word_replacements)
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(f"Detecting instances of: {custom_words}")
+
+                # Detect all instances of these words
+                matches = self.analyzer.analyze_profanity(
+                    video_path,
+                    custom_words=custom_words
+                )
+
+                # Override replacements with user's custom replacements
+                for match in matches:
+                    if match.word in word_replacements:
+                        match.replacement = word_replacements[match.word]
+
             if not matches:
                 logger.warning("No instances of target words found in video")
-                import shutil
-                shutil.copy(video_path, output_path)
+                self._fast_copy_or_link(video_path, output_path)
                 return output_path
             
             logger.info(f"Found {len(matches)} instances to replace")
@@ -843,44 +1508,31 @@ class ElevenLabsDubber:
             # Step 2: Cluster words into phrases for seamless dubbing
             clusters = self.cluster_matches(matches)
             
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-
-                dub_segments = []
-                for i, c in enumerate(clusters):
-                    # Generate speech
-                    raw_dub = temp_path / f"phrase_raw_{i}.mp3"
-                    self.generate_speech(
-                        text=c['phrase'],
-                        voice_type=voice_type,
-                        output_path=raw_dub
-                    )
-
-                    # Time-stretch to EXACTLY match user's timing
-                    target_duration = c['end_time'] - c['start_time']
-                    stretched_dub = temp_path / f"phrase_stretched_{i}.mp3"
-
-                    self.time_stretch_audio(
-                        input_path=raw_dub,
-                        output_path=stretched_dub,
-                        target_duration=target_duration
-                    )
+            # Per-job subdir under the reusable session temp root
+            temp_path = self._new_job_dir()
+
+            # Generate + stretch pipelined across thread pools
+            dub_segments = self._generate_and_stretch_segments(
+                clusters,
+                temp_path,
+                lambda c, out: self.generate_speech(
+                    text=c['phrase'], voice_type=voice_type, output_path=out
+                )
+            )
 
-                    dub_segments.append((stretched_dub, c['start_time'], c['end_time']))
+            # Patch audio using segments
+            self.patch_audio_seamless(
+                video_path=video_path,
+                dub_segments=dub_segments,
+                output_path=output_path
+            )
 
-                # Patch audio using segments
-                self.patch_audio_seamless(
-                    video_path=video_path,
-                    dub_segments=dub_segments,
-                    output_path=output_path
-                )
-                
-                logger.info(f"✅ Voice dubbing complete (clustered): {output_path}")
-                return output_path
+            logger.info(f"✅ Voice dubbing complete (clustered): {output_path}")
+            return output_path
                 
         except subprocess.CalledProcessError as e:
-            logger.error(f"FFmpeg dubbing failed: {e.stderr}")
-            raise RuntimeError(f"Failed to apply dubs: {e.stderr}")
+            logger.error(f"FFmpeg dubbing failed: {_stderr_text(e)}")
+            raise RuntimeError(f"Failed to apply dubs: {_stderr_text(e)}")
         except Exception as e:
             logger.error(f"Dubbing error: {e}")
             raise
@@ -912,8 +1564,7 @@ class ElevenLabsDubber:
         
         if not profanity_matches:
             logger.warning("No profanity matches provided, copying original video")
-            import shutil
-            shutil.copy(video_path, output_path)
+            self._fast_copy_or_link(video_path, output_path)
             return output_path
         
         logger.info(f"Dubbing {len(profanity_matches)} matches with {voice_type} voice (direct mode - no re-analysis)")
@@ -924,52 +1575,39 @@ class ElevenLabsDubber:
             logger.info(f"  Match {i}: word='{match.word}', replacement='{match.replacement}', time={match.start_time:.2f}-{match.end_time:.2f}s")
 
         try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-
-                # Step 1: Cluster matches into phrases
-                clusters = self.cluster_matches(profanity_matches)
-
-                # Debug: Log clusters generated
-                logger.info(f"DEBUG: Generated {len(clusters)} clusters:")
-                for i, c in enumerate(clusters):
-                    logger.info(f"  Cluster {i}: phrase='{c['phrase']}', time={c['start_time']:.2f}-{c['end_time']:.2f}s")
-                
-                dub_segments = []
-                for i, c in enumerate(clusters):
-                    # Generate speech
-                    raw_dub = temp_path / f"phrase_raw_{i}.mp3"
-                    self.generate_speech(
-                        text=c['phrase'],
-                        voice_type=voice_type,
-                        output_path=raw_dub
-                    )
-
-                    # Time-stretch to EXACTLY match user's timing
-                    target_duration = c['end_time'] - c['start_time']
-                    stretched_dub = temp_path / f"phrase_stretched_{i}.mp3"
-
-                    self.time_stretch_audio(
-                        input_path=raw_dub,
-                        output_path=stretched_dub,
-                        target_duration=target_duration
-                    )
+            # Per-job subdir under the reusable session temp root
+            temp_path = self._new_job_dir()
+
+            # Step 1: Cluster matches into phrases
+            clusters = self.cluster_matches(profanity_matches)
+
+            # Debug: Log clusters generated
+            logger.info(f"DEBUG: Generated {len(clusters)} clusters:")
+            for i, c in enumerate(clusters):
+                logger.info(f"  Cluster {i}: phrase='{c['phrase']}', time={c['start_time']:.2f}-{c['end_time']:.2f}s")
+
+            # Generate + stretch pipelined across thread pools
+            dub_segments = self._generate_and_stretch_segments(
+                clusters,
+                temp_path,
+                lambda c, out: self.generate_speech(
+                    text=c['phrase'], voice_type=voice_type, output_path=out
+                )
+            )
 
-                    dub_segments.append((stretched_dub, c['start_time'], c['end_time']))
+            # Seamlessly patch dubbed audio onto video
+            self.patch_audio_seamless(
+                video_path=video_path,
+                dub_segments=dub_segments,
+                output_path=output_path
+            )
 
-                # Seamlessly patch dubbed audio onto video
-                self.patch_audio_seamless(
-                    video_path=video_path,
-                    dub_segments=dub_segments,
-                    output_path=output_path
-                )
-                
-                logger.info(f"✅ Voice dubbing complete (direct): {output_path}")
-                return output_path
+            logger.info(f"✅ Voice dubbing complete (direct): {output_path}")
+            return output_path
                 
         except subprocess.CalledProcessError as e:
-            logger.error(f"FFmpeg dubbing failed: {e.stderr}")
-            raise RuntimeError(f"Failed to apply direct dubs: {e.stderr}")
+            logger.error(f"FFmpeg dubbing failed: {_stderr_text(e)}")
+            raise RuntimeError(f"Failed to apply direct dubs: {_stderr_text(e)}")
         except Exception as e:
             logger.error(f"Direct dubbing error: {e}")
             raise
@@ -1004,8 +1642,7 @@ class ElevenLabsDubber:
         
         if not word_replacements:
             logger.warning("No words to replace, copying original video")
-            import shutil
-            shutil.copy(video_path, output_path)
+            self._fast_copy_or_link(video_path, output_path)
             return output_path
         
         logger.info(f"🎙️ Dubbing {len(word_replacements)} word replacements with CLONED voice")
@@ -1021,7 +1658,7 @@ class ElevenLabsDubber:
                 end_time=voice_sample_end
             )
             
-            cloned_voice_id = self.create_instant_voice_clone(sample_path)
+            cloned_voice_id = self.get_or_create_voice_clone(sample_path)
             logger.info(f"✅ Voice cloned successfully: {cloned_voice_id}")
             
             # Step 1: Get profanity matches (re-analyze only if not provided)
@@ -1029,18 +1666,15 @@ class ElevenLabsDubber:
                 logger.info(f"Step 1: Using {len(profanity_matches)} provided matches (no re-analysis)")
                 matches = profanity_matches
             else:
-                from core.audio_analyzer import AudioAnalyzer
-                from app.config import get_settings
-                
-                settings = get_settings()
-                analyzer = AudioAnalyzer(api_key=settings.gemini_api_key)
-                
-                custom_words = list(word_replacements.keys())
-                logger.info(f"Detecting instances of: {custom_words}")
-                
-                # Detect all instances of these words
-                matches = analyzer.analyze_profanity(
-                    video_path,
+                custom_words = tuple(word_replacements)
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(f"Detecting instances of: {custom_words}")
+
+                # Analyze the pre-extracted audio track rather than the
+                # full video container
+                audio_path = self._extract_audio_wav(video_path) or video_path
+                matches = self.analyzer.analyze_profanity(
+                    audio_path,
                     custom_words=custom_words
                 )
             
@@ -1051,8 +1685,7 @@ class ElevenLabsDubber:
             
             if not matches:
                 logger.warning("No instances of target words found in video")
-                import shutil
-                shutil.copy(video_path, output_path)
+                self._fast_copy_or_link(video_path, output_path)
                 return output_path
             
             logger.info(f"Found {len(matches)} instances to replace with cloned voice")
@@ -1063,29 +1696,16 @@ class ElevenLabsDubber:
                 
                 # Step 1: Cluster matches into phrases for cloned voice
                 clusters = self.cluster_matches(matches)
-                
-                dub_segments = []
-                for i, c in enumerate(clusters):
-                    # Generate with cloned voice
-                    raw_dub = temp_path / f"phrase_raw_{i}.mp3"
-                    self.generate_speech_with_clone(
-                        text=c['phrase'],
-                        voice_id=cloned_voice_id,
-                        output_path=raw_dub
-                    )
-
-                    # Time-stretch to EXACTLY match user's timing
-                    target_duration = c['end_time'] - c['start_time']
-                    stretched_dub = temp_path / f"phrase_stretched_{i}.mp3"
 
-                    self.time_stretch_audio(
-                        input_path=raw_dub,
-                        output_path=stretched_dub,
-                        target_duration=target_duration
+                # Generate + stretch pipelined across thread pools
+                dub_segments = self._generate_and_stretch_segments(
+                    clusters,
+                    temp_path,
+                    lambda c, out: self.generate_speech_with_clone(
+                        text=c['phrase'], voice_id=cloned_voice_id, output_path=out
                     )
+                )
 
-                    dub_segments.append((stretched_dub, c['start_time'], c['end_time']))
-                
                 # Seamlessly patch dubbed audio onto video
                 self.patch_audio_seamless(
                     video_path=video_path,
@@ -1097,14 +1717,14 @@ class ElevenLabsDubber:
                 return output_path
                 
         except subprocess.CalledProcessError as e:
-            logger.error(f"FFmpeg dubbing failed: {e.stderr}")
-            raise RuntimeError(f"Failed to apply cloned dubs: {e.stderr}")
+            logger.error(f"FFmpeg dubbing failed: {_stderr_text(e)}")
+            raise RuntimeError(f"Failed to apply cloned dubs: {_stderr_text(e)}")
         except Exception as e:
             logger.error(f"Cloned dubbing error: {e}")
             raise
         finally:
-            # Clean up cloned voice to free quota
-            if cloned_voice_id:
+            # Clean up cloned voice to free quota (unless kept for reuse)
+            if cloned_voice_id and not self.persist_cloned_voices:
                 self.delete_cloned_voice(cloned_voice_id)
     
     def apply_dubs_multi_speaker(
@@ -1140,15 +1760,13 @@ class ElevenLabsDubber:
         cloned_voices = {}  # speaker_id -> voice_id
         
         try:
+            # Decode the audio track once; both analysis passes below reuse it
+            # instead of re-demuxing the full video
+            audio_path = self._extract_audio_wav(video_path) or video_path
+
             # Step 0: Detect speakers and find clean segments
-            from core.audio_analyzer import AudioAnalyzer
-            from app.config import get_settings
-            
-            settings = get_settings()
-            analyzer = AudioAnalyzer(api_key=settings.gemini_api_key)
-            
             logger.info("Step 0: Detecting speakers and clean segments...")
-            speaker_segments = analyzer.detect_speaker_segments(video_path)
+            speaker_segments = self.analyzer.detect_speaker_segments(audio_path)
             
             if not speaker_segments:
                 logger.warning("No speaker segments found. Falling back to single voice clone.")
@@ -1162,25 +1780,33 @@ class ElevenLabsDubber:
                     profanity_matches=profanity_matches  # ✅ Pass user's matches!
                 )
             
-            # Step 1: Create voice clone for each speaker
-            logger.info(f"Step 1: Creating {len(speaker_segments)} voice clones...")
-            for seg in speaker_segments:
+            # Step 1: Create voice clone for each speaker - sample extraction
+            # and clone upload are independent per speaker, so fan them out
+            from concurrent.futures import ThreadPoolExecutor, as_completed
+
+            unique_segments = {seg['speaker_id']: seg for seg in speaker_segments}
+            logger.info(f"Step 1: Creating {len(unique_segments)} voice clones...")
+
+            def clone_one(seg):
                 speaker_id = seg['speaker_id']
-                if speaker_id in cloned_voices:
-                    continue  # Already cloned this speaker
-                
                 sample_path = self.extract_audio_sample(
                     video_path=video_path,
                     start_time=seg['start_time'],
                     end_time=seg['end_time']
                 )
-                
-                voice_id = self.create_instant_voice_clone(
+                voice_id = self.get_or_create_voice_clone(
                     sample_path,
                     voice_name=f"VidMod_{speaker_id}_{seg.get('gender', 'unknown')}"
                 )
-                cloned_voices[speaker_id] = voice_id
-                logger.info(f"  ✅ Cloned {speaker_id} ({seg.get('gender', 'unknown')}): {voice_id}")
+                return speaker_id, voice_id
+
+            with ThreadPoolExecutor(max_workers=min(8, len(unique_segments))) as pool:
+                futures = [pool.submit(clone_one, seg) for seg in unique_segments.values()]
+                for fut in as_completed(futures):
+                    speaker_id, voice_id = fut.result()
+                    seg = unique_segments[speaker_id]
+                    cloned_voices[speaker_id] = voice_id
+                    logger.info(f"  ✅ Cloned {speaker_id} ({seg.get('gender', 'unknown')}): {voice_id}")
             
             # Step 2: Get profanity matches (re-analyze only if not provided)
             logger.info("Step 2: Getting profanity matches...")
@@ -1189,8 +1815,8 @@ class ElevenLabsDubber:
                 matches = profanity_matches
             else:
                 logger.info("  Analyzing audio for profanity with speaker identification...")
-                custom_words = list(custom_replacements.keys()) if custom_replacements else None
-                matches = analyzer.analyze_profanity(video_path, custom_words=custom_words)
+                custom_words = tuple(custom_replacements) if custom_replacements else None
+                matches = self.analyzer.analyze_profanity(audio_path, custom_words=custom_words)
             
             if custom_replacements:
                 for match in matches:
@@ -1199,8 +1825,7 @@ class ElevenLabsDubber:
             
             if not matches:
                 logger.warning("No profanity detected")
-                import shutil
-                shutil.copy(video_path, output_path)
+                self._fast_copy_or_link(video_path, output_path)
                 return output_path
             
             # Group matches by speaker
@@ -1214,36 +1839,25 @@ class ElevenLabsDubber:
                 
                 # Cluster matches into phrases per speaker
                 clusters = self.cluster_matches(matches)
-                
-                dub_segments = []
-                for i, c in enumerate(clusters):
+
+                def synthesize_for_speaker(c, out):
                     # Get the right voice clone for this speaker
                     voice_id = cloned_voices.get(c['speaker_id'])
                     if not voice_id:
                         # Fallback to first available voice
                         voice_id = list(cloned_voices.values())[0]
                         logger.warning(f"No clone for {c['speaker_id']}, using fallback")
-
-                    # Generate with cloned voice
-                    raw_dub = temp_path / f"phrase_raw_{i}.mp3"
-                    self.generate_speech_with_clone(
+                    return self.generate_speech_with_clone(
                         text=c['phrase'],
                         voice_id=voice_id,
-                        output_path=raw_dub
+                        output_path=out
                     )
 
-                    # Time-stretch to EXACTLY match user's timing
-                    target_duration = c['end_time'] - c['start_time']
-                    stretched_dub = temp_path / f"phrase_stretched_{i}.mp3"
-
-                    self.time_stretch_audio(
-                        input_path=raw_dub,
-                        output_path=stretched_dub,
-                        target_duration=target_duration
-                    )
+                # Generate + stretch pipelined across thread pools
+                dub_segments = self._generate_and_stretch_segments(
+                    clusters, temp_path, synthesize_for_speaker
+                )
 
-                    dub_segments.append((stretched_dub, c['start_time'], c['end_time']))
-                
                 # Step 4: Seamlessly patch dubbed audio onto video
                 logger.info("Step 4: Patching dubbed audio with phrase-based crossfade blending...")
                 
@@ -1257,15 +1871,21 @@ class ElevenLabsDubber:
                 return output_path
                 
         except subprocess.CalledProcessError as e:
-            logger.error(f"FFmpeg dubbing failed: {e.stderr}")
-            raise RuntimeError(f"Failed to apply multi-speaker dubs: {e.stderr}")
+            logger.error(f"FFmpeg dubbing failed: {_stderr_text(e)}")
+            raise RuntimeError(f"Failed to apply multi-speaker dubs: {_stderr_text(e)}")
         except Exception as e:
             logger.error(f"Multi-speaker dubbing error: {e}")
             raise
         finally:
-            # Clean up ALL cloned voices
-            for voice_id in cloned_voices.values():
-                self.delete_cloned_voice(voice_id)
-            logger.info(f"Cleaned up {len(cloned_voices)} cloned voices")
+            # Clean up ALL cloned voices - independent DELETEs, so fan out
+            # instead of paying one HTTPS round-trip per clone serially
+            # (skipped entirely when clones are kept for reuse)
+            if cloned_voices and not self.persist_cloned_voices:
+                from concurrent.futures import ThreadPoolExecutor
+                with ThreadPoolExecutor(max_workers=len(cloned_voices)) as pool:
+                    list(pool.map(self.delete_cloned_voice, cloned_voices.values()))
+                logger.info(f"Cleaned up {len(cloned_voices)} cloned voices")
+            elif cloned_voices:
+                logger.info(f"Keeping {len(cloned_voices)} cloned voices for reuse")
 
 
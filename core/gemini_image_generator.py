@@ -5,12 +5,25 @@ Uses Gemini 3 (gemini-3-pro-image-preview) for high-quality image generation.
 
 import logging
 import os
-import base64
 from pathlib import Path
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+IMAGE_MODEL = "gemini-2.5-flash-image"
+
+# Generated images cached in memory; each is a few hundred KB, so keep the
+# cache small and evict oldest-first
+IMAGE_CACHE_LIMIT = 32
+
+# Static halves of the enhanced prompt, built once at import
+PROMPT_PREFIX = "High-quality product photography of "
+PROMPT_SUFFIX = """.
+
+Style: Professional, clean background, studio lighting, high resolution.
+View: Front-facing, centered, well-lit.
+Quality: Sharp focus, detailed, photorealistic."""
+
 
 class GeminiImageGenerator:
     """
@@ -39,6 +52,14 @@ class GeminiImageGenerator:
             logger.info("Gemini Image Generator initialized (Gemini 3)")
         except ImportError:
             raise ImportError("google-genai package not installed. Run: pip install google-genai")
+
+        # Identical prompts reuse the cached result instead of paying a
+        # multi-second API call; _inflight dedupes concurrent duplicates so
+        # only one request hits the API
+        import threading
+        self._image_cache: dict = {}
+        self._cache_lock = threading.Lock()
+        self._inflight: dict = {}
     
     def generate_image(
         self,
@@ -58,33 +79,108 @@ class GeminiImageGenerator:
             Image data as bytes
         """
         logger.info(f"Generating image: {prompt}")
-        
+
         # Enhance the prompt for better reference images
         enhanced_prompt = self._enhance_prompt(prompt, negative_prompt)
-        
+
+        import hashlib
+        import threading
+        digest = hashlib.blake2b(
+            f"{IMAGE_MODEL}|{enhanced_prompt}".encode(), digest_size=16
+        ).hexdigest()
+
+        # Serve repeats from cache; if an identical request is already in
+        # flight, wait for it rather than issuing a duplicate API call
+        while True:
+            with self._cache_lock:
+                cached = self._image_cache.get(digest)
+                if cached is not None:
+                    logger.info("Reusing cached generated image")
+                    return cached
+                event = self._inflight.get(digest)
+                if event is None:
+                    self._inflight[digest] = threading.Event()
+                    break
+            event.wait()
+
         try:
-            # Use Gemini 2.0 Flash with native image generation
             response = self.client.models.generate_content(
-                model="gemini-2.5-flash-image",
+                model=IMAGE_MODEL,
                 contents=enhanced_prompt,
                 config=self.types.GenerateContentConfig(
                     response_modalities=['IMAGE', 'TEXT']
                 )
             )
-            
-            # Extract image from response parts
-            for part in response.candidates[0].content.parts:
-                if part.inline_data is not None:
-                    image_bytes = part.inline_data.data
-                    logger.info(f"✅ Image generated successfully ({len(image_bytes)/1024:.1f}KB)")
-                    return image_bytes
-            
-            raise ValueError("No image generated in response")
-                
+
+            image_bytes = self._extract_image(response)
+            logger.info(f"✅ Image generated successfully ({len(image_bytes)/1024:.1f}KB)")
+            with self._cache_lock:
+                if len(self._image_cache) >= IMAGE_CACHE_LIMIT:
+                    self._image_cache.pop(next(iter(self._image_cache)))
+                self._image_cache[digest] = image_bytes
+            return image_bytes
+
         except Exception as e:
             logger.error(f"Image generation failed: {e}")
             raise
+        finally:
+            with self._cache_lock:
+                self._inflight.pop(digest).set()
     
+    @staticmethod
+    def _extract_image(response) -> bytes:
+        """
+        Pull the first image part out of a generate_content response.
+
+        inline_data.data is already raw bytes in google-genai; only decode
+        when a (base64) str slips through, rather than re-decoding blindly.
+        """
+        for part in response.candidates[0].content.parts:
+            if part.inline_data is not None:
+                data = part.inline_data.data
+                if isinstance(data, str):
+                    import base64
+                    return base64.b64decode(data)
+                return data
+        raise ValueError("No image generated in response")
+
+    def generate_many(
+        self,
+        prompts: list,
+        max_workers: int = 8,
+        negative_prompt: Optional[str] = None
+    ) -> list:
+        """
+        Generate several images concurrently.
+
+        Each generation is a multi-second API round-trip, so K prompts run
+        across a small thread pool instead of serially; the in-flight dedupe
+        in generate_image already collapses duplicate prompts to one call.
+        Worker count doubles as the concurrency cap against Gemini rate
+        limits.
+
+        Args:
+            prompts: Image descriptions
+            max_workers: Maximum concurrent API calls
+            negative_prompt: Optional shared negative prompt
+
+        Returns:
+            List of image bytes in the same order as prompts
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        if not prompts:
+            return []
+        if len(prompts) == 1:
+            return [self.generate_image(prompts[0], negative_prompt=negative_prompt)]
+
+        workers = min(max_workers, len(prompts))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(
+                lambda p: self.generate_image(p, negative_prompt=negative_prompt),
+                prompts
+            ))
+
     def _enhance_prompt(self, prompt: str, negative_prompt: Optional[str] = None) -> str:
         """
         Enhance the prompt for better reference image generation.
@@ -96,17 +192,11 @@ class GeminiImageGenerator:
         Returns:
             Enhanced prompt optimized for product/object reference images
         """
-        # Add context for better reference images
-        enhanced = f"""High-quality product photography of {prompt}.
-        
-Style: Professional, clean background, studio lighting, high resolution.
-View: Front-facing, centered, well-lit.
-Quality: Sharp focus, detailed, photorealistic."""
-        
+        # Add context for better reference images; the boilerplate lives in
+        # module constants so only the variable parts are joined per call
         if negative_prompt:
-            enhanced += f"\n\nAvoid: {negative_prompt}"
-        
-        return enhanced
+            return "".join((PROMPT_PREFIX, prompt, PROMPT_SUFFIX, "\n\nAvoid: ", negative_prompt))
+        return PROMPT_PREFIX + prompt + PROMPT_SUFFIX
     
     def save_image(
         self,
@@ -162,5 +252,95 @@ Quality: Sharp focus, detailed, photorealistic."""
             aspect_ratio=aspect_ratio,
             negative_prompt=negative_prompt
         )
-        
+
         return self.save_image(image_bytes, output_path)
+
+    def generate_and_save_to_gcs(
+        self,
+        prompt: str,
+        key: str,
+        uploader,
+        aspect_ratio: str = "1:1",
+        negative_prompt: Optional[str] = None
+    ) -> str:
+        """
+        Generate an image and upload it straight to GCS.
+
+        Skips the local disk round-trip of generate_and_save + upload_image:
+        the generated bytes stream directly to the bucket.
+
+        Args:
+            prompt: Description of the image to generate
+            key: GCS object key for the image
+            uploader: GCSUploader instance
+            aspect_ratio: Image aspect ratio
+            negative_prompt: What to avoid
+
+        Returns:
+            Public URL of the uploaded image
+        """
+        image_bytes = self.generate_image(
+            prompt=prompt,
+            aspect_ratio=aspect_ratio,
+            negative_prompt=negative_prompt
+        )
+
+        return uploader.upload_image_bytes(image_bytes, key)
+
+    def generate_to_gcs(
+        self,
+        prompt: str,
+        key: str,
+        uploader,
+        negative_prompt: Optional[str] = None
+    ) -> str:
+        """
+        Stream a generated image into GCS without buffering it fully in RAM.
+
+        Image parts from the streaming generate call are written into the
+        blob's file-like resumable writer as they arrive, so peak memory is
+        one upload chunk instead of the whole image and the upload overlaps
+        the remaining generation.
+
+        Args:
+            prompt: Description of the image to generate
+            key: GCS object key for the image
+            uploader: GCSUploader instance
+            negative_prompt: What to avoid
+
+        Returns:
+            Public URL of the uploaded image
+        """
+        logger.info(f"Generating image to GCS: {prompt}")
+        enhanced_prompt = self._enhance_prompt(prompt, negative_prompt)
+
+        stream = self.client.models.generate_content_stream(
+            model=IMAGE_MODEL,
+            contents=enhanced_prompt,
+            config=self.types.GenerateContentConfig(
+                response_modalities=['IMAGE', 'TEXT']
+            )
+        )
+
+        blob = uploader.bucket.blob(key)
+        wrote = False
+        with blob.open("wb", content_type="image/png", chunk_size=256 * 1024) as writer:
+            for chunk in stream:
+                if not chunk.candidates:
+                    continue
+                for part in chunk.candidates[0].content.parts or ():
+                    if part.inline_data is not None and part.inline_data.data:
+                        data = part.inline_data.data
+                        if isinstance(data, str):
+                            import base64
+                            data = base64.b64decode(data)
+                        writer.write(data)
+                        wrote = True
+
+        if not wrote:
+            blob.delete()
+            raise ValueError("No image generated in response")
+
+        url = blob.public_url
+        logger.info(f"✅ Image streamed to GCS: {url}")
+        return url
@@ -4,19 +4,72 @@ Uses Nano Banana for object detection and replacement in individual frames.
 Now with SAM mask support and optimized prompts.
 """
 
+import bisect
 import logging
 import os
-import base64
+import random
+import shutil
+import time
 from pathlib import Path
 from typing import Optional, List
+import numpy as np
 from PIL import Image
 import io
 
+try:
+    from google import genai
+    from google.genai import types
+except ImportError:
+    genai = None
+    types = None
+
 logger = logging.getLogger(__name__)
 
+# Status codes worth retrying: rate limits and transient server-side failures
+_RETRYABLE_CODES = {429, 500, 502, 503, 504}
+
+
+def _call_with_retry(fn, *args, max_retries: int = 5, base: float = 1.0, **kwargs):
+    """
+    Call fn with exponential backoff on rate-limit and transient errors.
+
+    Concurrent keyframe editing makes 429s routine rather than exceptional;
+    jittered backoff turns them into extra latency instead of failed frames
+    that fall back to copying the original. Non-transient errors (bad
+    requests, auth) propagate immediately.
+    """
+    for attempt in range(max_retries):
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            transient = isinstance(e, (ConnectionError, TimeoutError))
+            if not transient:
+                code = getattr(e, "code", None) or getattr(e, "status_code", None)
+                transient = code in _RETRYABLE_CODES
+            if not transient or attempt == max_retries - 1:
+                raise
+
+            delay = base * (2 ** attempt) + random.uniform(0, 0.5)
+            # Honor a server-provided Retry-After when the SDK exposes one
+            headers = getattr(getattr(e, "response", None), "headers", None)
+            if headers:
+                try:
+                    delay = max(delay, float(headers.get("Retry-After")))
+                except (TypeError, ValueError):
+                    pass
+            logger.warning(
+                f"Gemini call failed ({e}), retrying in {delay:.1f}s "
+                f"(attempt {attempt + 1}/{max_retries})"
+            )
+            time.sleep(delay)
+
 # Gemini model for image editing (Nano Banana)
 GEMINI_IMAGE_MODEL = "gemini-3-pro-image-preview"
 
+# The image model works at roughly this resolution internally; sending larger
+# frames just wastes upload bytes on a server-side downsample
+MAX_UPLOAD_SIDE = 1024
+
 # Optimized prompts for better object replacement
 MAIN_PROMPT_TEMPLATE = """Replace the masked object with the {replacement} from the reference image.
 Match the lighting, color temperature, and perspective of the scene.
@@ -30,32 +83,132 @@ Keep the hand, fingers, shadows, reflections, and background exactly the same.
 The {replacement} should appear naturally in the same position as the original object.
 Photorealistic, seamless blending, no artifacts."""
 
-NEGATIVE_PROMPT = """blurry, distorted hand, extra fingers, deformed bottle, wrong scale, 
+NEGATIVE_PROMPT = """blurry, distorted hand, extra fingers, deformed bottle, wrong scale,
 floating object, changed background, mismatched lighting"""
 
+# Wrapper for multi-frame requests: K (frame, mask) pairs in, K edits out
+BATCH_PROMPT_TEMPLATE = """You are given {count} frame/mask image pairs in order: frame 1, mask 1, frame 2, mask 2, and so on. In each pair, the mask is white where the object must be replaced.
+
+For every pair: {prompt}
+
+Produce exactly {count} edited images, one per input pair, in the same order."""
+
 
 class GeminiInpaintEngine:
     """
     Frame-by-frame image editing using Gemini 3 Pro (Nano Banana).
     Supports SAM masks, reference images, and optimized prompts.
     """
-    
-    def __init__(self, api_key: str = None):
+
+    # Constant request config, built once on first use instead of being
+    # reallocated for every keyframe across the thread pool
+    _gen_config = None
+
+    @classmethod
+    def _generation_config(cls):
+        if cls._gen_config is None:
+            cls._gen_config = types.GenerateContentConfig(
+                response_modalities=["TEXT", "IMAGE"]
+            )
+        return cls._gen_config
+
+    def __init__(self, api_key: str = None, cache_dir: Optional[Path] = None):
         """
         Initialize Gemini Inpaint engine.
-        
+
         Args:
             api_key: Gemini API key (or uses GEMINI_API_KEY env var)
+            cache_dir: Optional directory for a content-addressed edit cache;
+                reruns over unchanged frame/mask/reference/prompt inputs
+                reuse the stored result instead of re-calling Gemini
         """
-        from google import genai
-        
+        if genai is None:
+            raise ImportError("google-genai package not installed. Run: pip install google-genai")
+
         self.api_key = api_key or os.getenv("GEMINI_API_KEY")
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY not set")
         
         self.client = genai.Client(api_key=self.api_key)
+        # Files-API handles for uploaded reference images, keyed by
+        # (path, mtime_ns) so the same reference isn't re-sent inline
+        # with every keyframe request
+        self._ref_cache: dict = {}
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
         logger.info("Gemini Inpaint engine initialized")
-    
+
+    def _edit_cache_key(
+        self,
+        frame_path: Path,
+        mask_path: Optional[Path],
+        reference_path: Optional[Path],
+        prompt: str,
+        use_composite: bool
+    ) -> str:
+        """Content hash over everything that determines an edit's output."""
+        import hashlib
+
+        h = hashlib.sha256()
+        h.update(Path(frame_path).read_bytes())
+        if mask_path and Path(mask_path).exists():
+            h.update(Path(mask_path).read_bytes())
+        if reference_path and Path(reference_path).exists():
+            h.update(Path(reference_path).read_bytes())
+        h.update(prompt.encode())
+        h.update(b"composite" if use_composite else b"multi")
+        return h.hexdigest()
+
+    def _cache_store(self, img: Image.Image, cache_key: str) -> None:
+        """Atomically persist an edit result (tmp write + rename)."""
+        tmp_path = self.cache_dir / f"{cache_key}.tmp"
+        img.save(tmp_path, format="PNG")
+        os.replace(tmp_path, self.cache_dir / f"{cache_key}.png")
+
+    def _upload_reference_once(self, reference_path: Path):
+        """
+        Upload a reference image via the Files API, reusing prior uploads.
+
+        Inlining the reference bytes into every edit_frame_with_mask request
+        multiplies upload bandwidth by the keyframe count; uploading once and
+        citing the file URI keeps per-request payloads to frame + mask only.
+
+        Returns:
+            The ACTIVE File handle, or None if the upload failed (caller
+            falls back to inlining the image)
+        """
+        reference_path = Path(reference_path)
+        st = reference_path.stat()
+        cache_key = (str(reference_path), st.st_mtime_ns)
+        cached = self._ref_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            ref_file = self.client.files.upload(file=reference_path)
+            while ref_file.state.name == "PROCESSING":
+                time.sleep(0.5)
+                ref_file = self.client.files.get(name=ref_file.name)
+            if ref_file.state.name == "FAILED":
+                raise RuntimeError(f"Reference upload failed: {ref_file.state}")
+        except Exception as e:
+            logger.warning(f"Reference upload via Files API failed: {e}, inlining image")
+            return None
+
+        logger.info(f"Reference image uploaded once: {ref_file.uri}")
+        self._ref_cache[cache_key] = ref_file
+        return ref_file
+
+    def close(self):
+        """Delete uploaded reference files from the Files API."""
+        for ref_file in self._ref_cache.values():
+            try:
+                self.client.files.delete(name=ref_file.name)
+            except Exception as e:
+                logger.warning(f"Failed to delete uploaded reference: {e}")
+        self._ref_cache.clear()
+
     def _create_composite_image(
         self,
         frame: Image.Image,
@@ -79,23 +232,29 @@ class GeminiInpaintEngine:
                 reference = reference.convert('RGB')
             images.append(reference)
         
-        # Calculate total width
-        widths = [img.width for img in images]
         max_height = max(img.height for img in images)
-        total_width = sum(widths)
-        
-        # Create composite
+
+        # Fast path: when heights already match (mask/reference rendered at
+        # frame resolution), one numpy hstack into a single contiguous buffer
+        # replaces the per-image paste copies
+        if all(img.height == max_height for img in images):
+            return Image.fromarray(np.hstack([
+                np.asarray(img if img.mode == 'RGB' else img.convert('RGB'), dtype=np.uint8)
+                for img in images
+            ]))
+
+        # Mismatched heights: resize each to max_height, then paste
+        total_width = sum(img.width for img in images)
         composite = Image.new('RGB', (total_width, max_height))
         x_offset = 0
         for img in images:
-            # Resize to match height if needed
             if img.height != max_height:
                 ratio = max_height / img.height
                 new_width = int(img.width * ratio)
                 img = img.resize((new_width, max_height), Image.LANCZOS)
             composite.paste(img, (x_offset, 0))
             x_offset += img.width
-        
+
         return composite
     
     def edit_frame_with_mask(
@@ -105,11 +264,12 @@ class GeminiInpaintEngine:
         reference_path: Optional[Path] = None,
         object_prompt: str = "object",
         replacement_prompt: str = "replacement object",
-        use_composite: bool = False
+        use_composite: bool = False,
+        reference_image: Optional[Image.Image] = None
     ) -> Image.Image:
         """
         Edit a single frame with mask and reference image support.
-        
+
         Args:
             frame_path: Path to the original frame
             mask_path: Path to the SAM mask (white = replace, black = keep)
@@ -117,21 +277,35 @@ class GeminiInpaintEngine:
             object_prompt: What object is being replaced
             replacement_prompt: What to replace it with
             use_composite: If True, stack images side-by-side for single-image models
-            
+            reference_image: Already-loaded (and RGB-converted) reference;
+                batch callers pass this so the same file isn't re-opened and
+                re-converted per keyframe
+
         Returns:
             Edited PIL Image
         """
-        from google.genai import types
-        
         logger.info(f"Editing frame: {frame_path}")
-        
-        # Load images
-        frame = Image.open(frame_path)
+
+        # Load images; the reference only needs pixels for composite mode or
+        # the inline fallback, so defer opening it until then. Everything
+        # uploaded is clamped to the model's working resolution; the edit is
+        # scaled back to the original frame size before returning
+        original_frame = Image.open(frame_path)
+        original_size = original_frame.size
+        frame = self._resize_to_max(original_frame)
         mask = Image.open(mask_path) if mask_path and Path(mask_path).exists() else None
-        reference = Image.open(reference_path) if reference_path and Path(reference_path).exists() else None
-        
+        if mask is not None:
+            mask = self._resize_to_max(mask)
+        has_reference = reference_image is not None or bool(
+            reference_path and Path(reference_path).exists()
+        )
+
+        def load_reference() -> Image.Image:
+            ref = reference_image if reference_image is not None else Image.open(reference_path)
+            return self._resize_to_max(ref)
+
         # Build prompt
-        if reference:
+        if has_reference:
             prompt = MAIN_PROMPT_TEMPLATE.format(replacement=replacement_prompt)
         else:
             prompt = MAIN_PROMPT_NO_REF_TEMPLATE.format(
@@ -140,10 +314,23 @@ class GeminiInpaintEngine:
             )
         
         logger.info(f"Prompt: {prompt[:100]}...")
-        
+
+        # Serve unchanged inputs from the disk cache; iterating on downstream
+        # settings otherwise re-pays every keyframe's API call on each run
+        cache_key = None
+        if self.cache_dir is not None:
+            cache_key = self._edit_cache_key(
+                frame_path, mask_path, reference_path, prompt, use_composite
+            )
+            cached_path = self.cache_dir / f"{cache_key}.png"
+            if cached_path.exists():
+                logger.info(f"Reusing cached edit for {frame_path}")
+                return Image.open(cached_path)
+
         # Build content based on mode
         if use_composite:
             # Single image mode with composite
+            reference = load_reference() if has_reference else None
             composite = self._create_composite_image(frame, mask, reference)
             composite_prompt = f"""The image shows three parts side by side:
 1. Left: the original frame to edit
@@ -164,39 +351,58 @@ Use the right image as reference for the replacement object."""
                 contents.append(mask)
                 contents[0] = f"The second image is a mask where white indicates the region to replace. {contents[0]}"
             
-            if reference:
-                contents.append(reference)
+            if has_reference:
+                # Reference the one-time Files API upload instead of
+                # re-serializing the image into every request
+                ref_file = (
+                    self._upload_reference_once(Path(reference_path))
+                    if reference_path and Path(reference_path).exists() else None
+                )
+                if ref_file is not None:
+                    contents.append(types.Part.from_uri(
+                        file_uri=ref_file.uri,
+                        mime_type=ref_file.mime_type
+                    ))
+                else:
+                    contents.append(load_reference())
                 contents[0] = f"{contents[0]} Use the reference image to match the appearance of the replacement object."
         
         try:
-            # Call Gemini API
-            response = self.client.models.generate_content(
+            # Call Gemini API, retrying through rate limits and 5xx blips
+            response = _call_with_retry(
+                self.client.models.generate_content,
                 model=GEMINI_IMAGE_MODEL,
                 contents=contents,
-                config=types.GenerateContentConfig(
-                    response_modalities=["TEXT", "IMAGE"]
-                )
+                config=self._generation_config()
             )
             
             # Check response
             if not response.candidates:
                 logger.warning("No candidates in response, returning original")
-                return frame
+                return original_frame
             
             candidate = response.candidates[0]
             if not candidate.content or not candidate.content.parts:
                 logger.warning("No parts in response, returning original")
-                return frame
+                return original_frame
             
-            # Extract generated image
+            # Extract generated image; inline_data.data is already raw bytes
+            # in the current SDK, so only decode if a base64 str slips through
             for part in candidate.content.parts:
                 if hasattr(part, 'inline_data') and part.inline_data is not None:
-                    image_data = part.inline_data.data
-                    image_bytes = base64.b64decode(image_data) if isinstance(image_data, str) else image_data
-                    return Image.open(io.BytesIO(image_bytes))
+                    data = part.inline_data.data
+                    if isinstance(data, str):
+                        import base64
+                        data = base64.b64decode(data)
+                    edited = Image.open(io.BytesIO(data))
+                    if edited.size != original_size:
+                        edited = edited.resize(original_size, Image.LANCZOS)
+                    if cache_key is not None:
+                        self._cache_store(edited, cache_key)
+                    return edited
             
             logger.warning("No image in response, returning original")
-            return frame
+            return original_frame
             
         except Exception as e:
             logger.error(f"Gemini image editing failed: {e}")
@@ -217,6 +423,293 @@ Use the right image as reference for the replacement object."""
             replacement_prompt=edit_prompt
         )
     
+    @staticmethod
+    def _resize_to_max(img: Image.Image, max_side: int = MAX_UPLOAD_SIDE) -> Image.Image:
+        """
+        Return img with its long edge clamped to max_side.
+
+        Returns the input unchanged when already small enough; never mutates,
+        so shared images (the batch reference) stay full-resolution for
+        callers that need them.
+        """
+        w, h = img.size
+        longest = max(w, h)
+        if longest <= max_side:
+            return img
+        scale = max_side / longest
+        return img.resize(
+            (max(1, round(w * scale)), max(1, round(h * scale))),
+            Image.LANCZOS
+        )
+
+    @staticmethod
+    def _intermediate_save(img: Image.Image, path: Path) -> None:
+        """
+        Save an intermediate frame as a lightly-compressed PNG.
+
+        Edited frames are re-read and re-encoded downstream, so the default
+        zlib level 6 buys nothing; compress_level=1 roughly halves encode
+        time for ~20% more disk on throwaway artifacts.
+        """
+        img.save(path, format="PNG", compress_level=1, optimize=False)
+
+    @staticmethod
+    def _nearest_keyframe(keyframe_indices: List[int], idx: int) -> int:
+        """
+        Nearest keyframe to idx via binary search on the sorted index list.
+
+        The old min(..., key=abs) scan made the fill phase
+        O(total_frames * keyframes); bisect brings each lookup to O(log K).
+        Ties break toward the earlier keyframe, matching min()'s behavior.
+        """
+        pos = bisect.bisect_left(keyframe_indices, idx)
+        if pos == 0:
+            return keyframe_indices[0]
+        if pos == len(keyframe_indices):
+            return keyframe_indices[-1]
+        before = keyframe_indices[pos - 1]
+        after = keyframe_indices[pos]
+        return before if idx - before <= after - idx else after
+
+    def _edit_keyframes_parallel(
+        self,
+        keyframe_indices: List[int],
+        frame_paths: List[Path],
+        edit_one,
+        output_dir: Path,
+        progress_callback,
+        max_workers: int
+    ) -> dict:
+        """
+        Edit keyframes concurrently through a bounded thread pool.
+
+        Each edit is a blocking Gemini round-trip, so keeping several requests
+        in flight makes wall time scale with latency, not keyframe count. A
+        failed edit falls back to copying the original, same as the old serial
+        loop, so one bad frame doesn't poison the batch.
+
+        Returns:
+            Dict mapping frame index -> saved output path
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        import threading
+
+        total = len(keyframe_indices)
+
+        def work(idx: int) -> Path:
+            output_path = output_dir / f"frame_{idx:06d}.png"
+            try:
+                edited_image = edit_one(idx)
+                self._intermediate_save(edited_image, output_path)
+            except Exception as e:
+                logger.warning(f"Failed to edit frame {idx}: {e}, copying original")
+                # Re-encode rather than copy: sources may be JPEG and the
+                # output name must carry real PNG bytes for the rebuild
+                Image.open(frame_paths[idx]).save(output_path)
+            return output_path
+
+        edited_frames = {}
+        done = 0
+        progress_lock = threading.Lock()
+
+        workers = min(max_workers, total) or 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(work, idx): idx for idx in keyframe_indices}
+            for future in as_completed(futures):
+                idx = futures[future]
+                edited_frames[idx] = future.result()
+                with progress_lock:
+                    done += 1
+                    count = done
+                logger.info(f"Edited keyframe {count}/{total}")
+                if progress_callback:
+                    progress_callback(count / total * 100, f"Editing frame {count}/{total}")
+
+        return edited_frames
+
+    def _edit_frame_batch(
+        self,
+        indices: List[int],
+        frame_paths,
+        mask_paths: List[Path],
+        reference_path: Optional[Path],
+        reference_image: Optional[Image.Image],
+        replacement_prompt: str
+    ) -> List[Image.Image]:
+        """
+        Edit several (frame, mask) pairs in a single generate_content request.
+
+        Amortizes the fixed per-request cost (headers, TLS, model spin-up)
+        across the batch. Raises ValueError when the response doesn't carry
+        exactly one image per input pair; the caller falls back to per-frame
+        editing for that batch.
+
+        Returns:
+            Edited images in the same order as indices, scaled back to each
+            frame's original size
+        """
+        prompt = MAIN_PROMPT_TEMPLATE.format(replacement=replacement_prompt)
+        contents = [BATCH_PROMPT_TEMPLATE.format(count=len(indices), prompt=prompt)]
+
+        has_reference = reference_image is not None or bool(
+            reference_path and Path(reference_path).exists()
+        )
+        if has_reference:
+            ref_file = (
+                self._upload_reference_once(Path(reference_path))
+                if reference_path and Path(reference_path).exists() else None
+            )
+            if ref_file is not None:
+                contents.append(types.Part.from_uri(
+                    file_uri=ref_file.uri,
+                    mime_type=ref_file.mime_type
+                ))
+            else:
+                ref = reference_image if reference_image is not None else Image.open(reference_path)
+                contents.append(self._resize_to_max(ref))
+            contents[0] = (
+                f"{contents[0]}\n\nThe first image is the reference for the "
+                f"replacement object; the frame/mask pairs follow it."
+            )
+
+        original_sizes = []
+        for idx in indices:
+            frame = Image.open(frame_paths[idx])
+            original_sizes.append(frame.size)
+            contents.append(self._resize_to_max(frame))
+
+            mask_path = mask_paths[idx] if idx < len(mask_paths) else None
+            if not (mask_path and Path(mask_path).exists()):
+                raise ValueError(f"No mask for frame {idx}; batch mode needs frame/mask pairs")
+            contents.append(self._resize_to_max(Image.open(mask_path)))
+
+        response = _call_with_retry(
+            self.client.models.generate_content,
+            model=GEMINI_IMAGE_MODEL,
+            contents=contents,
+            config=self._generation_config()
+        )
+
+        images = []
+        if response.candidates and response.candidates[0].content:
+            for part in response.candidates[0].content.parts or ():
+                if hasattr(part, 'inline_data') and part.inline_data is not None:
+                    data = part.inline_data.data
+                    if isinstance(data, str):
+                        import base64
+                        data = base64.b64decode(data)
+                    images.append(Image.open(io.BytesIO(data)))
+
+        if len(images) != len(indices):
+            raise ValueError(
+                f"Batched edit returned {len(images)} images for {len(indices)} pairs"
+            )
+
+        return [
+            img.resize(size, Image.LANCZOS) if img.size != size else img
+            for img, size in zip(images, original_sizes)
+        ]
+
+    def _edit_keyframes_batched(
+        self,
+        keyframe_indices: List[int],
+        frame_paths,
+        edit_batch,
+        edit_one,
+        output_dir: Path,
+        progress_callback,
+        max_workers: int,
+        batch_size: int
+    ) -> dict:
+        """
+        Edit keyframes in multi-frame batches across the thread pool.
+
+        Each batch is one API round-trip; a batch whose response can't be
+        paired back to its inputs is retried frame by frame, so batching can
+        only degrade to per-frame behavior, never lose frames.
+
+        Returns:
+            Dict mapping frame index -> saved output path
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        import threading
+
+        total = len(keyframe_indices)
+        batches = [
+            keyframe_indices[i:i + batch_size]
+            for i in range(0, total, batch_size)
+        ]
+
+        def work(batch: List[int]) -> dict:
+            results = {}
+            try:
+                images = edit_batch(batch)
+                for idx, img in zip(batch, images):
+                    output_path = output_dir / f"frame_{idx:06d}.png"
+                    self._intermediate_save(img, output_path)
+                    results[idx] = output_path
+            except Exception as e:
+                logger.warning(f"Batched edit failed ({e}), editing frames individually")
+                for idx in batch:
+                    output_path = output_dir / f"frame_{idx:06d}.png"
+                    try:
+                        self._intermediate_save(edit_one(idx), output_path)
+                    except Exception as frame_error:
+                        logger.warning(
+                            f"Failed to edit frame {idx}: {frame_error}, copying original"
+                        )
+                        Image.open(frame_paths[idx]).save(output_path)
+                    results[idx] = output_path
+            return results
+
+        edited_frames = {}
+        done = 0
+        progress_lock = threading.Lock()
+
+        workers = min(max_workers, len(batches)) or 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(work, batch) for batch in batches]
+            for future in as_completed(futures):
+                results = future.result()
+                edited_frames.update(results)
+                with progress_lock:
+                    done += len(results)
+                    count = done
+                logger.info(f"Edited keyframe {count}/{total}")
+                if progress_callback:
+                    progress_callback(count / total * 100, f"Editing frame {count}/{total}")
+
+        return edited_frames
+
+    def _fill_non_keyframes(
+        self,
+        total_frames: int,
+        keyframe_indices: List[int],
+        edited_frames: dict,
+        output_dir: Path
+    ) -> List[Path]:
+        """
+        Materialize every frame index, duplicating from the nearest keyframe.
+
+        Byte-identical duplicates are hard-linked instead of paying a PNG
+        decode + re-encode, copying only across filesystems.
+        """
+        output_paths = []
+        for idx in range(total_frames):
+            output_path = output_dir / f"frame_{idx:06d}.png"
+
+            if idx in edited_frames:
+                output_paths.append(edited_frames[idx])
+            else:
+                nearest_keyframe = self._nearest_keyframe(keyframe_indices, idx)
+                nearest_path = edited_frames[nearest_keyframe]
+                try:
+                    os.link(nearest_path, output_path)
+                except OSError:
+                    shutil.copyfile(nearest_path, output_path)
+                output_paths.append(output_path)
+        return output_paths
+
     def process_frames_with_masks(
         self,
         frame_paths: List[Path],
@@ -227,11 +720,13 @@ Use the right image as reference for the replacement object."""
         frame_interval: int = 1,
         output_dir: Optional[Path] = None,
         use_composite: bool = False,
-        progress_callback=None
+        progress_callback=None,
+        max_workers: int = 4,
+        batch_size: int = 1
     ) -> List[Path]:
         """
         Process multiple frames with corresponding masks and a reference image.
-        
+
         Args:
             frame_paths: List of paths to original frames
             mask_paths: List of paths to SAM masks (same order as frames)
@@ -242,67 +737,171 @@ Use the right image as reference for the replacement object."""
             output_dir: Directory to save edited frames
             use_composite: Use composite image mode
             progress_callback: Progress callback function
-            
+            max_workers: Concurrent Gemini edit requests
+            batch_size: Frame/mask pairs packed per request (>1 amortizes
+                per-request overhead; falls back to per-frame on mismatch)
+
         Returns:
             List of paths to edited frames
         """
         if output_dir is None:
             output_dir = frame_paths[0].parent / "edited_frames_v2"
         output_dir.mkdir(parents=True, exist_ok=True)
-        
+
         total_frames = len(frame_paths)
         keyframe_indices = list(range(0, total_frames, frame_interval))
-        
+
         logger.info(f"Processing {len(keyframe_indices)} keyframes with masks")
-        
-        edited_frames = {}
-        output_paths = []
-        
-        # Process keyframes
-        for i, idx in enumerate(keyframe_indices):
-            frame_path = frame_paths[idx]
-            mask_path = mask_paths[idx] if idx < len(mask_paths) else None
-            output_path = output_dir / f"frame_{idx:06d}.png"
-            
-            try:
-                edited_image = self.edit_frame_with_mask(
-                    frame_path=frame_path,
-                    mask_path=mask_path,
-                    reference_path=reference_image_path,
-                    object_prompt=object_prompt,
-                    replacement_prompt=replacement_prompt,
-                    use_composite=use_composite
+
+        # Load and RGB-convert the shared reference once; per-keyframe calls
+        # would otherwise repeat the same open + convert for every request
+        reference_image = None
+        if reference_image_path and Path(reference_image_path).exists():
+            reference_image = Image.open(reference_image_path)
+            if reference_image.mode != 'RGB':
+                reference_image = reference_image.convert('RGB')
+
+        def edit_one(idx: int) -> Image.Image:
+            return self.edit_frame_with_mask(
+                frame_path=frame_paths[idx],
+                mask_path=mask_paths[idx] if idx < len(mask_paths) else None,
+                reference_path=reference_image_path,
+                object_prompt=object_prompt,
+                replacement_prompt=replacement_prompt,
+                use_composite=use_composite,
+                reference_image=reference_image
+            )
+
+        if batch_size > 1 and not use_composite:
+            def edit_batch(batch: List[int]) -> List[Image.Image]:
+                return self._edit_frame_batch(
+                    batch, frame_paths, mask_paths,
+                    reference_image_path, reference_image, replacement_prompt
                 )
-                
-                edited_image.save(output_path)
-                edited_frames[idx] = output_path
-                
-                logger.info(f"Edited keyframe {i+1}/{len(keyframe_indices)}")
-                
-            except Exception as e:
-                logger.warning(f"Failed to edit frame {idx}: {e}, copying original")
-                Image.open(frame_path).save(output_path)
-                edited_frames[idx] = output_path
-            
-            if progress_callback:
-                progress = (i + 1) / len(keyframe_indices) * 100
-                progress_callback(progress, f"Editing frame {i+1}/{len(keyframe_indices)}")
-        
+
+            edited_frames = self._edit_keyframes_batched(
+                keyframe_indices, frame_paths, edit_batch, edit_one,
+                output_dir, progress_callback, max_workers, batch_size
+            )
+        else:
+            edited_frames = self._edit_keyframes_parallel(
+                keyframe_indices, frame_paths, edit_one,
+                output_dir, progress_callback, max_workers
+            )
         # Fill in non-keyframes
-        for idx in range(total_frames):
-            output_path = output_dir / f"frame_{idx:06d}.png"
-            
-            if idx in edited_frames:
-                output_paths.append(edited_frames[idx])
-            else:
-                nearest_keyframe = min(keyframe_indices, key=lambda k: abs(k - idx))
-                nearest_path = edited_frames[nearest_keyframe]
-                Image.open(nearest_path).save(output_path)
-                output_paths.append(output_path)
-        
+        output_paths = self._fill_non_keyframes(
+            total_frames, keyframe_indices, edited_frames, output_dir
+        )
+
         logger.info(f"Processed {total_frames} frames ({len(keyframe_indices)} edited)")
         return output_paths
-    
+
+    def process_video_with_masks(
+        self,
+        video_path: Path,
+        mask_paths: List[Path],
+        reference_image_path: Path,
+        object_prompt: str = "object",
+        replacement_prompt: str = "bottle",
+        frame_interval: int = 1,
+        output_dir: Optional[Path] = None,
+        use_composite: bool = False,
+        progress_callback=None,
+        max_workers: int = 4
+    ) -> List[Path]:
+        """
+        Edit a video without pre-extracting every frame to disk.
+
+        process_frames_with_masks requires the upstream extractor to decode
+        all N frames even when only every frame_interval-th one is edited.
+        This entry point reads the video directly: cap.grab() advances past
+        skipped frames without the full decode, and cap.retrieve() decodes
+        keyframes only, so decode work scales with the keyframe count.
+
+        Args:
+            video_path: Path to the source video
+            mask_paths: List of paths to SAM masks, indexed by frame number
+            reference_image_path: Path to reference image for replacement
+            object_prompt: What object is being replaced
+            replacement_prompt: What to replace it with
+            frame_interval: Edit every Nth frame
+            output_dir: Directory to save edited frames
+            use_composite: Use composite image mode
+            progress_callback: Progress callback function
+            max_workers: Concurrent Gemini edit requests
+
+        Returns:
+            List of paths to edited frames (same naming as the frame-list API)
+        """
+        import cv2
+
+        video_path = Path(video_path)
+        if output_dir is None:
+            output_dir = video_path.parent / "edited_frames_v2"
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        # Decoded keyframes land here; they double as the copy-original
+        # fallback source for failed edits
+        keyframes_dir = output_dir / "source_keyframes"
+        keyframes_dir.mkdir(exist_ok=True)
+
+        cap = cv2.VideoCapture(str(video_path))
+        if not cap.isOpened():
+            raise RuntimeError(f"Could not open video: {video_path}")
+
+        keyframe_indices = []
+        frame_paths: dict = {}
+        idx = 0
+        try:
+            while cap.grab():
+                if idx % frame_interval == 0:
+                    ret, frame = cap.retrieve()
+                    if ret:
+                        src_path = keyframes_dir / f"frame_{idx:06d}.png"
+                        cv2.imwrite(str(src_path), frame, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+                        keyframe_indices.append(idx)
+                        frame_paths[idx] = src_path
+                idx += 1
+        finally:
+            cap.release()
+        total_frames = idx
+
+        logger.info(
+            f"Decoded {len(keyframe_indices)} keyframes out of {total_frames} "
+            f"frames (interval {frame_interval})"
+        )
+
+        # Load and RGB-convert the shared reference once, as in the
+        # frame-list entry point
+        reference_image = None
+        if reference_image_path and Path(reference_image_path).exists():
+            reference_image = Image.open(reference_image_path)
+            if reference_image.mode != 'RGB':
+                reference_image = reference_image.convert('RGB')
+
+        def edit_one(frame_idx: int) -> Image.Image:
+            return self.edit_frame_with_mask(
+                frame_path=frame_paths[frame_idx],
+                mask_path=mask_paths[frame_idx] if frame_idx < len(mask_paths) else None,
+                reference_path=reference_image_path,
+                object_prompt=object_prompt,
+                replacement_prompt=replacement_prompt,
+                use_composite=use_composite,
+                reference_image=reference_image
+            )
+
+        edited_frames = self._edit_keyframes_parallel(
+            keyframe_indices, frame_paths, edit_one,
+            output_dir, progress_callback, max_workers
+        )
+
+        output_paths = self._fill_non_keyframes(
+            total_frames, keyframe_indices, edited_frames, output_dir
+        )
+
+        logger.info(f"Processed {total_frames} frames ({len(keyframe_indices)} edited)")
+        return output_paths
+
     def process_frames(
         self,
         frame_paths: List[Path],
@@ -311,7 +910,8 @@ Use the right image as reference for the replacement object."""
         reference_image_path: Optional[Path] = None,
         frame_interval: int = 1,
         output_dir: Optional[Path] = None,
-        progress_callback=None
+        progress_callback=None,
+        max_workers: int = 4
     ) -> List[Path]:
         """
         Legacy method - process multiple frames with object replacement.
@@ -334,46 +934,21 @@ Use the right image as reference for the replacement object."""
                 replacement=replacement_prompt
             )
         
-        edited_frames = {}
-        output_paths = []
-        
-        # Process keyframes
-        for i, idx in enumerate(keyframe_indices):
-            frame_path = frame_paths[idx]
-            output_path = output_dir / f"frame_{idx:06d}.png"
-            
-            try:
-                edited_image = self.edit_frame(
-                    image_path=frame_path,
-                    edit_prompt=edit_prompt,
-                    reference_image_path=reference_image_path
-                )
-                
-                edited_image.save(output_path)
-                edited_frames[idx] = output_path
-                
-                logger.info(f"Edited keyframe {i+1}/{len(keyframe_indices)}: {output_path}")
-                
-            except Exception as e:
-                logger.warning(f"Failed to edit frame {idx}: {e}, copying original")
-                Image.open(frame_path).save(output_path)
-                edited_frames[idx] = output_path
-            
-            if progress_callback:
-                progress = (i + 1) / len(keyframe_indices) * 100
-                progress_callback(progress, f"Editing frame {i+1}/{len(keyframe_indices)}")
-        
+        def edit_one(idx: int) -> Image.Image:
+            return self.edit_frame(
+                image_path=frame_paths[idx],
+                edit_prompt=edit_prompt,
+                reference_image_path=reference_image_path
+            )
+
+        edited_frames = self._edit_keyframes_parallel(
+            keyframe_indices, frame_paths, edit_one,
+            output_dir, progress_callback, max_workers
+        )
         # Fill in non-keyframes by copying from nearest keyframe
-        for idx in range(total_frames):
-            output_path = output_dir / f"frame_{idx:06d}.png"
-            
-            if idx in edited_frames:
-                output_paths.append(edited_frames[idx])
-            else:
-                nearest_keyframe = min(keyframe_indices, key=lambda k: abs(k - idx))
-                nearest_path = edited_frames[nearest_keyframe]
-                Image.open(nearest_path).save(output_path)
-                output_paths.append(output_path)
-        
+        output_paths = self._fill_non_keyframes(
+            total_frames, keyframe_indices, edited_frames, output_dir
+        )
+
         logger.info(f"Processed {total_frames} frames ({len(keyframe_indices)} edited)")
         return output_paths
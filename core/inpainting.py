@@ -6,36 +6,182 @@ Object replacement using Stable Diffusion Inpainting via Replicate.
 import replicate
 import base64
 import httpx
+import shutil
+import struct
 from pathlib import Path
 from PIL import Image
 import io
 import logging
 from typing import Optional, List
-import numpy as np
+
+# pybase64's SIMD encoder is 3-10x faster on multi-MB frames; optional,
+# stdlib base64 otherwise
+try:
+    import pybase64 as _b64
+except ImportError:
+    _b64 = base64
 
 logger = logging.getLogger(__name__)
 
 
+def _copy_frame_as_png(frame_path: Path, output_path: Path) -> None:
+    """
+    Copy a frame to a .png destination, re-encoding non-PNG sources.
+
+    The rebuild step feeds frame_%06d.png to ffmpeg's image2 demuxer,
+    which picks the decoder from the extension, so JPEG bytes must never
+    hide behind a .png name. Already-PNG sources are copied verbatim.
+    """
+    if frame_path.suffix == ".png":
+        shutil.copy(frame_path, output_path)
+    else:
+        with Image.open(frame_path) as img:
+            img.save(output_path)
+
+
+def _fast_image_size(image_path: Path) -> tuple:
+    """
+    Read (width, height) straight from the file header.
+
+    The pipeline only needs dimensions here, so parsing the few header
+    bytes that carry them skips PIL's plugin dispatch and image-object
+    construction per frame. Covers the formats the pipeline produces
+    (PNG, JPEG, WebP); anything else falls back to PIL.
+    """
+    with open(image_path, "rb") as f:
+        head = f.read(32)
+
+        # PNG: IHDR width/height are big-endian u32 at offset 16
+        if head.startswith(b"\x89PNG\r\n\x1a\n"):
+            return struct.unpack(">II", head[16:24])
+
+        # JPEG: walk segment markers to the first SOF frame header
+        if head.startswith(b"\xff\xd8"):
+            f.seek(2)
+            while True:
+                marker = f.read(2)
+                if len(marker) < 2 or marker[0] != 0xFF:
+                    break
+                code = marker[1]
+                if code == 0xD9:  # EOI
+                    break
+                if code == 0x01 or 0xD0 <= code <= 0xD8:  # standalone markers
+                    continue
+                length_bytes = f.read(2)
+                if len(length_bytes) < 2:
+                    break
+                length = struct.unpack(">H", length_bytes)[0]
+                if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+                    data = f.read(5)
+                    height, width = struct.unpack(">HH", data[1:5])
+                    return width, height
+                f.seek(length - 2, 1)
+
+        # WebP: dimensions live in the first VP8/VP8L/VP8X chunk
+        elif head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+            fmt = head[12:16]
+            if fmt == b"VP8X":
+                f.seek(24)
+                data = f.read(6)
+                return (
+                    1 + int.from_bytes(data[0:3], "little"),
+                    1 + int.from_bytes(data[3:6], "little"),
+                )
+            if fmt == b"VP8 ":
+                f.seek(26)
+                data = f.read(4)
+                return (
+                    struct.unpack("<H", data[0:2])[0] & 0x3FFF,
+                    struct.unpack("<H", data[2:4])[0] & 0x3FFF,
+                )
+            if fmt == b"VP8L":
+                f.seek(21)
+                bits = int.from_bytes(f.read(4), "little")
+                return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+
+    with Image.open(image_path) as img:
+        return img.size
+
+
 class InpaintingEngine:
     """
     Inpainting and object replacement using Stable Diffusion via Replicate.
     Supports both text prompts and reference images.
     """
-    
+
+    # Shared download client so batch inpainting reuses pooled connections
+    # instead of paying a TCP+TLS handshake per result
+    _http: Optional[httpx.Client] = None
+
+    @classmethod
+    def _http_client(cls) -> httpx.Client:
+        """Lazily build the shared pooled HTTP client."""
+        if cls._http is None:
+            kwargs = {
+                "timeout": 300.0,
+                "follow_redirects": True,
+                "limits": httpx.Limits(max_keepalive_connections=16),
+            }
+            try:
+                cls._http = httpx.Client(http2=True, **kwargs)
+            except ImportError:
+                # http2 extra (h2) not installed; HTTP/1.1 keep-alive still pools
+                cls._http = httpx.Client(**kwargs)
+        return cls._http
+
+
     # Replicate model for inpainting
     SDXL_INPAINT_MODEL = "stability-ai/stable-diffusion-inpainting:95b7223104132402a9ae91cc677285bc5eb997834bd2349fa486f53910fd68b3"
     SD_INPAINT_MODEL = "andreasjansson/stable-diffusion-inpainting:e490d072a34a94a11e9711ed5a6ba621c3fab884eda1665d9d3a282d65a21571"
+
+    # 256-entry threshold table for Image.point: binary at 128, same cut as
+    # the previous numpy (arr > 128) pass but in one C loop with no
+    # intermediate array allocations
+    _THRESH_LUT = bytes(0 if i <= 128 else 255 for i in range(256))
     
     def __init__(self, api_token: str):
         """Initialize with Replicate API token."""
         if not api_token:
             raise ValueError("Replicate API token is required")
         self.client = replicate.Client(api_token=api_token)
-    
+        # Uploaded URLs keyed by (path, mtime_ns, size) so repeated frames
+        # and shared masks upload their bytes once, not per call
+        self._upload_cache: dict = {}
+        # Prepared-mask URIs keyed by (content digest, target size); frame
+        # sequences usually share one mask geometry
+        self._mask_cache: dict = {}
+
+    def _upload_file(self, image_path: Path) -> str:
+        """
+        Upload a file to Replicate once and return its URL.
+
+        Inlining base64 data URIs re-reads and re-encodes every byte on
+        every call and inflates the JSON body by a third; uploading through
+        the files API sends the bytes once and passes a short URL instead.
+        Falls back to a data URI if the upload fails.
+        """
+        image_path = Path(image_path)
+        st = image_path.stat()
+        cache_key = (str(image_path), st.st_mtime_ns, st.st_size)
+        cached = self._upload_cache.get(cache_key)
+        if cached:
+            return cached
+
+        try:
+            with open(image_path, "rb") as f:
+                file_obj = self.client.files.create(file=f)
+            url = file_obj.urls["get"]
+        except Exception as e:
+            logger.warning(f"Replicate file upload failed: {e}, inlining as data URI")
+            return self._image_to_base64_uri(image_path)
+
+        self._upload_cache[cache_key] = url
+        return url
+
     def _image_to_base64_uri(self, image_path: Path) -> str:
         """Convert image file to base64 data URI."""
         with open(image_path, "rb") as f:
-            data = base64.b64encode(f.read()).decode("utf-8")
+            data = _b64.b64encode(f.read()).decode("utf-8")
         
         suffix = image_path.suffix.lower()
         mime_types = {
@@ -50,7 +196,7 @@ class InpaintingEngine:
     
     def _download_image(self, url: str, output_path: Path) -> Path:
         """Download image from URL."""
-        response = httpx.get(url, follow_redirects=True)
+        response = self._http_client().get(url)
         response.raise_for_status()
         
         with open(output_path, "wb") as f:
@@ -66,20 +212,48 @@ class InpaintingEngine:
         with Image.open(mask_path) as mask:
             # Convert to grayscale
             mask = mask.convert("L")
-            
+
             # Resize if needed
             if mask.size != target_size:
                 mask = mask.resize(target_size, Image.LANCZOS)
-            
+
             # Ensure binary (threshold at 128)
-            mask_arr = np.array(mask)
-            mask_arr = (mask_arr > 128).astype(np.uint8) * 255
-            
+            mask = mask.point(self._THRESH_LUT)
+
             # Save processed mask
             processed_path = mask_path.parent / f"processed_{mask_path.name}"
-            Image.fromarray(mask_arr).save(processed_path)
-            
+            mask.save(processed_path)
+
             return processed_path
+
+    def _mask_uri(self, mask_path: Path, target_size: tuple) -> str:
+        """
+        Prepare and upload a mask once per unique (content, size).
+
+        Identical masks across a frame sequence previously re-ran
+        _prepare_mask and re-uploaded the processed PNG for every frame;
+        hashing the raw mask bytes collapses that to one preparation and
+        one upload.
+        """
+        import hashlib
+
+        digest = hashlib.blake2b(Path(mask_path).read_bytes(), digest_size=16).digest()
+        cache_key = (digest, target_size)
+        cached = self._mask_cache.get(cache_key)
+        if cached:
+            return cached
+
+        processed_mask = self._prepare_mask(mask_path, target_size)
+        uri = self._upload_file(processed_mask)
+
+        # The processed PNG is only needed long enough to upload
+        try:
+            processed_mask.unlink()
+        except OSError:
+            pass
+
+        self._mask_cache[cache_key] = uri
+        return uri
     
     def inpaint_with_text(
         self,
@@ -110,14 +284,12 @@ class InpaintingEngine:
         """
         logger.info(f"Inpainting with prompt: '{prompt}'")
         
-        # Get original image size
-        with Image.open(image_path) as img:
-            target_size = img.size
+        # Get original image size from the header; no decode needed
+        target_size = _fast_image_size(image_path)
         
         # Prepare inputs
-        image_uri = self._image_to_base64_uri(image_path)
-        processed_mask = self._prepare_mask(mask_path, target_size)
-        mask_uri = self._image_to_base64_uri(processed_mask)
+        image_uri = self._upload_file(image_path)
+        mask_uri = self._mask_uri(mask_path, target_size)
         
         input_params = {
             "image": image_uri,
@@ -144,11 +316,7 @@ class InpaintingEngine:
                 result_url = str(output)
             
             result_path = self._download_image(result_url, output_path)
-            
-            # Cleanup processed mask
-            if processed_mask.exists():
-                processed_mask.unlink()
-            
+
             return result_path
             
         except Exception as e:
@@ -189,36 +357,45 @@ class InpaintingEngine:
         mask_paths: List[Path],
         prompt: str,
         output_dir: Path,
-        seed: int = 42
+        seed: int = 42,
+        max_concurrency: int = 8
     ) -> List[Path]:
         """
         Inpaint multiple frames with consistent seed for temporal coherence.
-        
+
+        Each frame is an independent Replicate round-trip of seconds to
+        minutes, so frames run across a bounded thread pool instead of
+        serially; max_concurrency doubles as the throttle against
+        Replicate's rate limit.
+
         Args:
             frame_paths: List of original frame paths
             mask_paths: List of corresponding mask paths
             prompt: Replacement prompt
             output_dir: Directory to save inpainted frames
             seed: Fixed seed for consistency across frames
-            
+            max_concurrency: Concurrent Replicate requests
+
         Returns:
-            List of inpainted frame paths
+            List of inpainted frame paths, in frame order
         """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
         output_dir.mkdir(parents=True, exist_ok=True)
-        inpainted_frames = []
-        
-        logger.info(f"Inpainting {len(frame_paths)} frames with prompt: '{prompt}'")
-        
-        for i, (frame_path, mask_path) in enumerate(zip(frame_paths, mask_paths)):
+        total = min(len(frame_paths), len(mask_paths))
+
+        logger.info(f"Inpainting {total} frames with prompt: '{prompt}'")
+
+        def work(i: int) -> Path:
+            frame_path = frame_paths[i]
+            mask_path = mask_paths[i]
             output_path = output_dir / f"frame_{i:06d}.png"
-            
+
             if mask_path is None or not mask_path.exists():
                 # No mask - copy original frame
-                import shutil
-                shutil.copy(frame_path, output_path)
-                inpainted_frames.append(output_path)
-                continue
-            
+                _copy_frame_as_png(frame_path, output_path)
+                return output_path
+
             try:
                 self.inpaint_with_text(
                     image_path=frame_path,
@@ -227,14 +404,20 @@ class InpaintingEngine:
                     output_path=output_path,
                     seed=seed  # Same seed for consistency
                 )
-                inpainted_frames.append(output_path)
-                logger.info(f"Inpainted frame {i+1}/{len(frame_paths)}")
-                
             except Exception as e:
                 logger.warning(f"Failed to inpaint frame {i}: {e}")
                 # Fall back to original frame
-                import shutil
-                shutil.copy(frame_path, output_path)
-                inpainted_frames.append(output_path)
-        
-        return inpainted_frames
+                _copy_frame_as_png(frame_path, output_path)
+            return output_path
+
+        results = {}
+        workers = min(max_concurrency, total) or 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(work, i): i for i in range(total)}
+            done = 0
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                done += 1
+                logger.info(f"Inpainted frame {done}/{total}")
+
+        return [results[i] for i in range(total)]
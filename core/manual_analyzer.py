@@ -2,6 +2,7 @@
 Gemini Manual Analyzer - Analyze specific regions of a video frame for identification and remediation suggestions.
 """
 
+import io
 import logging
 import os
 import json
@@ -67,18 +68,46 @@ class ManualAnalyzer:
         right = max(left + 1, min(right, width))
         bottom = max(top + 1, min(bottom, height))
 
-        # Crop the image to focus Gemini on exactly what the user selected
+        # For JPEG sources let libjpeg decimate during decode: draft() picks
+        # a DCT-domain scale no smaller than the crop, so a small selection
+        # decodes a fraction of the full frame's pixels
+        if frame_path.suffix.lower() in (".jpg", ".jpeg"):
+            image.draft("RGB", (max(1, int(right - left)), max(1, int(bottom - top))))
+            if image.size != (width, height):
+                scale_x = image.size[0] / width
+                scale_y = image.size[1] / height
+                left, right = left * scale_x, right * scale_x
+                top, bottom = top * scale_y, bottom * scale_y
+
+        # Crop the image to focus Gemini on exactly what the user selected;
+        # load() materializes just the crop and frees the full-frame buffer
         cropped_image = image.crop((left, top, right, bottom))
-        
+        cropped_image.load()
+        image.close()
+
         # Save a temporary crop for debugging (optional but helpful)
         # cropped_image.save(frame_path.parent / f"crop_{os.path.basename(frame_path)}")
 
+        # Encode the crop ourselves so the upload is a compact JPEG instead
+        # of the SDK's default lossless PNG. Tiny crops stay PNG: JPEG
+        # artifacts hurt there and the size win is negligible
+        buffer = io.BytesIO()
+        if cropped_image.size[0] < 64 or cropped_image.size[1] < 64:
+            cropped_image.save(buffer, format="PNG")
+            mime_type = "image/png"
+        else:
+            if cropped_image.mode != "RGB":
+                cropped_image = cropped_image.convert("RGB")
+            cropped_image.save(buffer, format="JPEG", quality=85)
+            mime_type = "image/jpeg"
+        image_part = types.Part.from_bytes(data=buffer.getvalue(), mime_type=mime_type)
+
         try:
             response = self.client.models.generate_content(
                 model=GEMINI_IMAGE_MODEL,
                 contents=[
                     MANUAL_ANALYSIS_PROMPT,
-                    cropped_image
+                    image_part
                 ],
                 config=types.GenerateContentConfig(
                     response_mime_type="application/json"
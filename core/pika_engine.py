@@ -6,6 +6,7 @@ Uses fal.ai Pika v2 Pikadditions for adding/replacing objects in videos.
 import logging
 import os
 import fal_client
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 import httpx
@@ -21,7 +22,28 @@ class PikaEngine:
     Video object replacement using Pika Labs Pikadditions.
     Better at shape-changing object replacement than VACE.
     """
-    
+
+    # Shared download client so repeated jobs reuse pooled connections
+    # instead of paying a TCP+TLS handshake per result
+    _http: Optional[httpx.Client] = None
+
+    @classmethod
+    def _http_client(cls) -> httpx.Client:
+        """Lazily build the shared pooled HTTP client."""
+        if cls._http is None:
+            kwargs = {
+                "timeout": 300.0,
+                "follow_redirects": True,
+                "limits": httpx.Limits(max_keepalive_connections=16),
+            }
+            try:
+                cls._http = httpx.Client(http2=True, **kwargs)
+            except ImportError:
+                # http2 extra (h2) not installed; HTTP/1.1 keep-alive still pools
+                cls._http = httpx.Client(**kwargs)
+        return cls._http
+
+
     def __init__(self, api_key: str = None):
         """
         Initialize Pika engine.
@@ -34,17 +56,28 @@ class PikaEngine:
             raise ValueError("FAL_KEY not set")
         
         os.environ["FAL_KEY"] = self.api_key
+        # Cache of uploaded file URLs keyed by (path, mtime, size) so
+        # repeated jobs on the same video/reference skip re-uploading
+        self._upload_cache: dict = {}
         logger.info("Pika engine initialized")
-    
+
     def _upload_file(self, file_path: Path) -> str:
         """Upload a local file to fal.ai and return the URL."""
         file_path = Path(file_path)
         if not file_path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
-        
+
+        stat = file_path.stat()
+        cache_key = (str(file_path), stat.st_mtime_ns, stat.st_size)
+        cached = self._upload_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Reusing uploaded URL for {file_path}")
+            return cached
+
         logger.info(f"Uploading file to fal.ai: {file_path}")
         url = fal_client.upload_file(str(file_path))
         logger.info(f"Uploaded: {url}")
+        self._upload_cache[cache_key] = url
         return url
     
     def replace_object(
@@ -74,9 +107,18 @@ class PikaEngine:
         logger.info(f"Video: {video_path}")
         logger.info(f"Prompt: {prompt}")
         
-        # Upload video
-        video_url = self._upload_file(video_path)
-        
+        # Upload video and reference concurrently: the reference upload is
+        # much smaller and rides along inside the video's transfer time
+        has_reference = reference_image_path and Path(reference_image_path).exists()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            video_future = executor.submit(self._upload_file, video_path)
+            ref_future = (
+                executor.submit(self._upload_file, reference_image_path)
+                if has_reference else None
+            )
+            video_url = video_future.result()
+            ref_url = ref_future.result() if ref_future else None
+
         # Build request
         request = {
             "video_url": video_url,
@@ -85,11 +127,10 @@ class PikaEngine:
             "duration": min(duration, 10),
             "aspect_ratio": aspect_ratio,
         }
-        
+
         # Add reference image if provided
-        if reference_image_path and Path(reference_image_path).exists():
+        if ref_url:
             logger.info(f"Using reference image: {reference_image_path}")
-            ref_url = self._upload_file(reference_image_path)
             request["image_url"] = ref_url
         
         logger.info("Calling Pika API...")
@@ -152,13 +193,12 @@ class PikaEngine:
         # Download the result
         logger.info(f"Downloading result to {output_path}")
         
-        with httpx.Client(timeout=300.0) as client:
-            response = client.get(video_url, follow_redirects=True)
-            response.raise_for_status()
-            
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(output_path, 'wb') as f:
-                f.write(response.content)
+        response = self._http_client().get(video_url)
+        response.raise_for_status()
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'wb') as f:
+            f.write(response.content)
         
         logger.info(f"Downloaded: {output_path}")
         return output_path
@@ -541,7 +541,14 @@ class VideoPipeline:
                     audio_path=job_dir / "audio.aac"
                 )
                 if job.frames_dir.exists():
-                    job.frame_paths = sorted(job.frames_dir.glob("*.png"))
+                    # Frames are JPEG by default, PNG for older jobs. Never
+                    # mix suffixes: the synchronous preview frame_000000.png
+                    # coexists with the JPEG extraction and would duplicate
+                    # frame 0 and shift every later index by one
+                    frame_paths = sorted(job.frames_dir.glob("*.jpg"))
+                    if not frame_paths:
+                        frame_paths = sorted(job.frames_dir.glob("*.png"))
+                    job.frame_paths = frame_paths
 
                 self.jobs[job_id] = job
                 return job
@@ -138,9 +138,11 @@ def track_findings_in_job(job: Any, findings: List[Dict[str, Any]]) -> List[Dict
     Apply tracking to all findings in a job.
     Updates each finding with a 'path' property containing the tracked boxes.
     """
-    # Refresh frame paths from disk if they seem missing or incomplete
+    # Refresh frame paths from disk if they seem missing or incomplete.
+    # Frames are JPEG by default, PNG for older jobs; prefer JPEG so the
+    # preview frame_000000.png never mixes into a JPEG job's frame list
     if hasattr(job, 'frames_dir') and job.frames_dir.exists():
-        disk_frames = sorted(job.frames_dir.glob("*.png"))
+        disk_frames = sorted(job.frames_dir.glob("*.jpg")) or sorted(job.frames_dir.glob("*.png"))
         if len(disk_frames) > len(job.frame_paths or []):
             logger.info(f"Discovered {len(disk_frames)} frames on disk for job {job.job_id} (increased from {len(job.frame_paths or [])})")
             job.frame_paths = disk_frames